@@ -0,0 +1,86 @@
+"""
+load_test.py
+
+Load test for the HTTP service (streamlit_app/api.py). Sends requests from a pool of concurrent
+clients for a fixed duration and reports throughput, latency percentiles and status code counts.
+
+Usage:
+    python benchmarks/load_test.py [--url http://localhost:8000] [--endpoint recommend]
+                                   [--concurrency 16] [--duration 30]
+"""
+import argparse
+import json
+import statistics
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from startup import SAMPLE_RESUME
+
+SAMPLE_JD = "Looking for a Python developer with SQL, machine learning and Flask experience."
+
+PAYLOADS = {
+    "score": {"text": SAMPLE_RESUME, "role": "Data Science"},
+    "recommend": {"text": SAMPLE_RESUME, "top_n": 5},
+    "match-jd": {"resume_text": SAMPLE_RESUME, "jd_text": SAMPLE_JD},
+}
+
+def percentile(sorted_values, q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(round(q * (len(sorted_values) - 1))))]
+
+def client(url: str, body: bytes, stop_at: float, latencies: list, statuses: Counter, lock: threading.Lock) -> None:
+    while time.perf_counter() < stop_at:
+        request = urllib.request.Request(url, data=body, headers={"Content-Type": "application/json"})
+        start = time.perf_counter()
+        try:
+            with urllib.request.urlopen(request, timeout=60) as response:
+                response.read()
+                status = response.status
+        except urllib.error.HTTPError as e:
+            status = e.code
+        except OSError:
+            status = "connection-error"
+        elapsed = time.perf_counter() - start
+        with lock:
+            statuses[status] += 1
+            if status == 200:
+                latencies.append(elapsed)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure throughput and tail latency of the HTTP service.")
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--endpoint", choices=sorted(PAYLOADS), default="recommend")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds to run.")
+    args = parser.parse_args()
+    url = f"{args.url.rstrip('/')}/{args.endpoint}"
+    body = json.dumps(PAYLOADS[args.endpoint]).encode("utf-8")
+    latencies: list = []
+    statuses: Counter = Counter()
+    lock = threading.Lock()
+    start = time.perf_counter()
+    stop_at = start + args.duration
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        for _ in range(args.concurrency):
+            pool.submit(client, url, body, stop_at, latencies, statuses, lock)
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    report = {
+        "endpoint": args.endpoint,
+        "concurrency": args.concurrency,
+        "requests": sum(statuses.values()),
+        "throughput_rps": round(len(latencies) / elapsed, 2),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+        "mean_ms": round(statistics.mean(latencies) * 1000, 2) if latencies else 0.0,
+        "status_counts": {str(k): v for k, v in statuses.items()},
+    }
+    print(json.dumps(report, indent=2))
+
+if __name__ == "__main__":
+    main()
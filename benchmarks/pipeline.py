@@ -0,0 +1,170 @@
+"""
+pipeline.py
+
+Per-stage benchmark for the analysis pipeline with regression gates. Each stage runs in a fresh
+process (so peak RSS is attributable to that stage) over resumes sampled from
+data/UpdatedResumeDataSet.csv, plus PDF/DOCX resumes generated locally from the same texts.
+Reports throughput, p50/p99 latency and peak RSS per stage, can save the result as a JSON baseline,
+and exits non-zero when a stage regresses past the threshold against a saved baseline.
+
+Usage:
+    python benchmarks/pipeline.py --save-baseline            # record benchmarks/baseline.json
+    python benchmarks/pipeline.py --threshold 0.2            # compare against it, fail on >20% regressions
+    python benchmarks/pipeline.py --stages ner recommend_roles --samples 100
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import statistics
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Tuple
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+APP_DIR = os.path.join(ROOT, "streamlit_app")
+DATASET = os.path.join(ROOT, "data", "UpdatedResumeDataSet.csv")
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+SAMPLE_JD = ("We are hiring a data scientist with strong Python, SQL and machine learning skills, experience with "
+             "pandas, numpy, scikit-learn and deep learning frameworks, and the ability to communicate results.")
+
+STAGES = ["extract_pdf", "extract_docx", "extract_sections", "ner", "extract_entities", "calculate_score",
+          "recommend_roles", "match_jd", "report_pdf", "report_html"]
+
+def load_corpus(samples: int, seed: int) -> List[str]:
+    import pandas as pd
+    texts = pd.read_csv(DATASET, usecols=["Resume"])["Resume"].dropna().astype(str)
+    return texts.sample(n=min(samples, len(texts)), random_state=seed).tolist()
+
+def write_synthetic_files(texts: List[str], directory: str) -> Tuple[List[str], List[str]]:
+    """Write each text as a PDF and a DOCX resume; returns (pdf_paths, docx_paths)."""
+    import docx
+    from fpdf import FPDF
+    pdfs, docxs = [], []
+    for i, text in enumerate(texts):
+        pdf = FPDF()
+        pdf.add_page()
+        pdf.set_font("Arial", size=10)
+        pdf.multi_cell(0, 5, text.encode("latin-1", "replace").decode("latin-1"))
+        pdfs.append(os.path.join(directory, f"resume_{i}.pdf"))
+        pdf.output(pdfs[-1])
+        document = docx.Document()
+        for line in text.splitlines() or [text]:
+            document.add_paragraph(line)
+        docxs.append(os.path.join(directory, f"resume_{i}.docx"))
+        document.save(docxs[-1])
+    return pdfs, docxs
+
+def _stage(name: str, texts: List[str], pdfs: List[str], docxs: List[str]) -> Tuple[Callable, list]:
+    """Return (callable, inputs) for a stage; imports happen here, inside the stage's own process."""
+    if name in ("extract_pdf", "extract_docx"):
+        from resume_parser import extract_text_from_file
+        return extract_text_from_file, pdfs if name == "extract_pdf" else docxs
+    if name == "extract_sections":
+        from resume_parser import extract_sections
+        return extract_sections, texts
+    if name == "ner":
+        from resume_parser import get_nlp, header_region
+        nlp = get_nlp()
+        return (lambda text: nlp(header_region(text))), texts
+    if name == "extract_entities":
+        from resume_parser import extract_entities
+        return extract_entities, texts
+    if name == "calculate_score":
+        from score_resume import SKILL_KEYWORDS, calculate_score
+        return (lambda text: [calculate_score(text, role) for role in SKILL_KEYWORDS]), texts
+    if name == "recommend_roles":
+        from recommender import ResumeRecommender
+        recommender = ResumeRecommender()
+        return (lambda text: recommender.recommend_roles(text, top_n=10)), texts
+    if name == "match_jd":
+        from jd_matcher import match_resume_to_jd
+        return (lambda text: match_resume_to_jd(text, SAMPLE_JD)), texts
+    if name in ("report_pdf", "report_html"):
+        from reports import render_html_report, render_pdf_report
+        from score_resume import SKILL_KEYWORDS, match_skills
+        render = render_pdf_report if name == "report_pdf" else render_html_report
+        roles = [(role, 100.0 / len(SKILL_KEYWORDS)) for role in SKILL_KEYWORDS]
+        inputs = [("Data Science", 42.0) + match_skills(text, SKILL_KEYWORDS["Data Science"]) for text in texts]
+        return (lambda args: render(*args, roles)), inputs
+    raise ValueError(f"Unknown stage: {name}")
+
+def _peak_rss_mb() -> float:
+    try:
+        import resource
+    except ImportError:  # Windows
+        return 0.0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+def run_stage(name: str, texts: List[str], pdfs: List[str], docxs: List[str]) -> Dict[str, float]:
+    """Time one stage over its inputs (in the calling process) after one warm-up call."""
+    sys.path.insert(0, APP_DIR)
+    func, inputs = _stage(name, texts, pdfs, docxs)
+    func(inputs[0])
+    latencies = []
+    start = time.perf_counter()
+    for item in inputs:
+        t0 = time.perf_counter()
+        func(item)
+        latencies.append(time.perf_counter() - t0)
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "n": len(latencies),
+        "throughput_per_s": round(len(latencies) / elapsed, 2),
+        "p50_ms": round(statistics.median(latencies) * 1000, 3),
+        "p99_ms": round(latencies[min(len(latencies) - 1, int(0.99 * len(latencies)))] * 1000, 3),
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+
+def compare(results: Dict[str, dict], baseline: Dict[str, dict], threshold: float) -> List[str]:
+    """Return human-readable regressions of p50 latency or throughput beyond threshold."""
+    regressions = []
+    for stage, result in results.items():
+        base = baseline.get(stage)
+        if not base:
+            continue
+        if result["p50_ms"] > base["p50_ms"] * (1 + threshold):
+            regressions.append(f"{stage}: p50 {base['p50_ms']}ms -> {result['p50_ms']}ms")
+        if result["throughput_per_s"] < base["throughput_per_s"] * (1 - threshold):
+            regressions.append(f"{stage}: throughput {base['throughput_per_s']}/s -> {result['throughput_per_s']}/s")
+    return regressions
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark each pipeline stage and gate on regressions.")
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=STAGES)
+    parser.add_argument("--samples", type=int, default=200, help="Resumes sampled from the dataset.")
+    parser.add_argument("--file-samples", type=int, default=20, help="Synthetic PDF/DOCX files to extract.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline JSON to compare against or write.")
+    parser.add_argument("--save-baseline", action="store_true", help="Write results as the new baseline.")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed relative regression (0.2 = 20%%).")
+    args = parser.parse_args()
+
+    texts = load_corpus(args.samples, args.seed)
+    ctx = multiprocessing.get_context("spawn")
+    results: Dict[str, dict] = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        pdfs, docxs = write_synthetic_files(texts[:args.file_samples], workdir)
+        for stage in args.stages:
+            with ctx.Pool(1) as pool:
+                results[stage] = pool.apply(run_stage, (stage, texts, pdfs, docxs))
+            print(f"{stage:<18} {json.dumps(results[stage])}", file=sys.stderr)
+
+    print(json.dumps(results, indent=2))
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        return
+    if os.path.isfile(args.baseline):
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        if regressions:
+            print("Regressions:\n  " + "\n  ".join(regressions), file=sys.stderr)
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+startup.py
+
+Cold-start benchmark for the resume parser. Each run starts a fresh interpreter and reports how long
+`import resume_parser` takes and the latency of the first and second `extract_entities` call
+(the first one includes loading the spaCy pipeline).
+
+Usage:
+    python benchmarks/startup.py [--runs 5] [--resume path/to/resume.txt]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+APP_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "streamlit_app"))
+
+SAMPLE_RESUME = """John Smith
+john.smith@email.com | +1 555 123 4567
+Skills
+Python, SQL, machine learning, pandas, numpy, Flask, HTML, CSS, JavaScript
+Experience
+Software Developer Intern | DataSoft Solutions | June 2021 - August 2021
+Education
+Bachelor of Science in Computer Science, Tech University
+"""
+
+CHILD = """
+import json, sys, time
+t0 = time.perf_counter()
+import resume_parser
+t1 = time.perf_counter()
+resume_parser.extract_entities(sys.argv[1])
+t2 = time.perf_counter()
+resume_parser.extract_entities(sys.argv[1])
+t3 = time.perf_counter()
+print(json.dumps({"import_s": t1 - t0, "first_request_s": t2 - t1, "warm_request_s": t3 - t2}))
+"""
+
+def run_once(text: str) -> dict:
+    """Measure one cold start in a fresh interpreter."""
+    env = dict(os.environ, PYTHONPATH=APP_DIR + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    out = subprocess.run([sys.executable, "-W", "ignore", "-c", CHILD, text], env=env,
+                         capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark resume_parser import and first-request latency.")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--resume", help="Plain-text resume to parse (defaults to a built-in sample).")
+    args = parser.parse_args()
+    text = SAMPLE_RESUME
+    if args.resume:
+        with open(args.resume, "r", encoding="utf-8") as f:
+            text = f.read()
+    runs = [run_once(text) for _ in range(args.runs)]
+    report = {key: {"median_s": round(statistics.median(r[key] for r in runs), 4),
+                    "max_s": round(max(r[key] for r in runs), 4)}
+              for key in runs[0]}
+    print(json.dumps(report, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+analyzer.py
+
+Framework-independent analyzer core shared by the Streamlit app and the HTTP service: parsing,
+keyword scoring, role recommendation and JD matching, each as a plain function over text or bytes.
+"""
+import threading
+from typing import List, Optional, Sequence, Tuple
+
+import config
+from jd_matcher import match_resume_to_jd
+from instrumentation import count, span, timed
+from micro_batcher import MicroBatcher
+from recommender import ResumeRecommender
+from resume_parser import get_nlp, parse_resume, parse_resume_bytes
+from score_resume import SKILL_KEYWORDS, get_skill_matcher, match_skills, score_all_roles
+from skill_demand import get_skill_demand
+
+_recommender: Optional[ResumeRecommender] = None
+_recommend_batcher: Optional[MicroBatcher] = None
+_recommender_lock = threading.Lock()
+
+def get_recommender() -> ResumeRecommender:
+    """Return the process-wide ResumeRecommender."""
+    global _recommender
+    if _recommender is None:
+        with _recommender_lock:
+            if _recommender is None:
+                _recommender = ResumeRecommender()
+    return _recommender
+
+def _recommend_batch(items: List[Tuple[str, int]]) -> List[List[Tuple[str, float]]]:
+    """Batch function for the micro-batcher: one transform/predict_proba for every queued request."""
+    top_n = max(n for _, n in items)
+    ranked = get_recommender().recommend_roles_batch([text for text, _ in items], top_n=top_n)
+    return [roles[:max(n, 1)] for roles, (_, n) in zip(ranked, items)]
+
+def get_recommend_batcher() -> MicroBatcher:
+    """Return the process-wide micro-batcher that coalesces concurrent recommend() calls."""
+    global _recommend_batcher
+    if _recommend_batcher is None:
+        with _recommender_lock:
+            if _recommend_batcher is None:
+                _recommend_batcher = MicroBatcher(_recommend_batch, config.RECOMMEND_BATCH_MAX_SIZE,
+                                                  config.RECOMMEND_BATCH_MAX_WAIT_MS, name="recommend-batcher")
+    return _recommend_batcher
+
+def warm_up() -> None:
+    """Load spaCy, the skill matcher and the classifier up front (e.g. in a worker initializer)."""
+    get_nlp()
+    get_skill_matcher()
+    get_recommender()
+
+def parse_file(path: str) -> dict:
+    """Parse a resume on disk."""
+    return parse_resume(path)
+
+def parse_bytes(data: bytes, filename: str) -> dict:
+    """Parse resume file contents held in memory."""
+    return parse_resume_bytes(data, filename)
+
+@timed("analyzer_score")
+def score(resume_text: str, role: Optional[str] = None, skills: Optional[Sequence[str]] = None) -> dict:
+    """
+    Score a resume against a role's keywords or a custom skill list.
+    Matched keywords, missing keywords and the score all come from one matcher pass. When the
+    skill-demand table (skill_demand.py) is built, missing keywords are ranked by how many of the
+    role's resumes mention them.
+
+    Returns:
+        dict: {"role", "score", "matched", "missing", "missing_demand"}; score is 0-100 and
+        missing_demand maps each missing keyword to the % of the role's resumes that mention it.
+    """
+    if not skills:
+        if role not in SKILL_KEYWORDS:
+            raise ValueError(f"Unknown role: {role}")
+        skills = SKILL_KEYWORDS[role]
+    skills = list(skills)
+    matched, missing = match_skills(resume_text or "", skills)
+    count("keyword_matches", len(matched))
+    value = round(100 * len(matched) / len(skills), 2)
+    demand = {}
+    table = get_skill_demand() if role else None
+    if table is not None:
+        missing = table.rank_missing(role, missing)
+        demand = {skill: round(table.demand(role, skill)[0] * 100, 1) for skill in missing}
+    return {"role": role, "score": value, "matched": matched, "missing": missing, "missing_demand": demand}
+
+def recommend(resume_text: str, top_n: int = 5) -> List[Tuple[str, float]]:
+    """Top N (role, probability %) recommendations, batched with concurrent callers."""
+    # The model runs on the batcher thread, so the request-side span includes the queue wait.
+    with span("recommend"):
+        return get_recommend_batcher()((resume_text, top_n))
+
+async def recommend_async(resume_text: str, top_n: int = 5) -> List[Tuple[str, float]]:
+    """Awaitable recommend() for asyncio callers."""
+    return await get_recommend_batcher().submit_async((resume_text, top_n))
+
+def match_jd(resume_text: str, jd_text: str, threshold: float = 50) -> dict:
+    """Similarity score and verdict for a resume against a job description."""
+    return match_resume_to_jd(resume_text, jd_text, threshold=threshold)
+
+@timed("place_on_map")
+def place_on_map(resume_text: str, k: int = 10) -> dict:
+    """Position, cluster and nearest corpus resumes of a resume on the talent map."""
+    from talent_map import get_talent_map
+    return get_talent_map().place(resume_text, k=k)
+
+def analyze_bytes(data: bytes, filename: str, top_n: int = 5) -> dict:
+    """Parse, recommend and score one resume against every role (the /batch unit of work)."""
+    parsed = parse_bytes(data, filename)
+    if parsed.get("error"):
+        return {"filename": filename, "error": parsed["error"]}
+    text = parsed.pop("text", "")
+    return {
+        "filename": filename,
+        "error": "",
+        "entities": parsed,
+        # Already one resume per worker task, so skip the batcher's wait.
+        "roles": get_recommender().recommend_roles(text, top_n=top_n),
+        "scores": score_all_roles(text),
+    }
@@ -0,0 +1,212 @@
+"""
+api.py
+
+Async HTTP service around the analyzer core, for programmatic (e.g. ATS) access. CPU-bound work runs
+in a bounded process pool; requests beyond config.API_MAX_PENDING are rejected with 429 and requests
+that exceed config.API_TIMEOUT_SECONDS get 504. A timed-out task, in the pool or in the
+recommendation micro-batcher, keeps its capacity until it actually finishes, so timeouts cannot push
+more work in than the cap. A crashed worker gets 503 and the pool is rebuilt. Uploads are read into
+memory with a size cap and parsed from bytes, so nothing is written to disk.
+
+Usage (requires fastapi, uvicorn and python-multipart):
+    cd streamlit_app && uvicorn api:app --host 0.0.0.0 --port 8000
+"""
+import asyncio
+import threading
+from contextlib import asynccontextmanager, contextmanager
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Optional
+
+from fastapi import FastAPI, File, Form, HTTPException, UploadFile
+from fastapi.responses import PlainTextResponse
+from pydantic import BaseModel
+
+import analyzer
+import config
+import instrumentation
+
+UPLOAD_CHUNK_BYTES = 64 * 1024
+
+class ScoreRequest(BaseModel):
+    text: str
+    role: Optional[str] = None
+    skills: Optional[List[str]] = None
+
+class RecommendRequest(BaseModel):
+    text: str
+    top_n: int = 5
+
+class TalentMapRequest(BaseModel):
+    texts: List[str]
+    k: int = 10
+
+class MatchJDRequest(BaseModel):
+    resume_text: str
+    jd_text: str
+    threshold: float = 50
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+_pending = 0
+# Executor done-callbacks release capacity from the pool's management thread.
+_pending_lock = threading.Lock()
+
+def _new_pool() -> ProcessPoolExecutor:
+    return ProcessPoolExecutor(max_workers=config.API_WORKERS, initializer=analyzer.warm_up)
+
+def _replace_broken_pool(broken: ProcessPoolExecutor) -> None:
+    """Swap in a fresh pool after a worker died; concurrent callers replace it only once."""
+    global _pool
+    with _pool_lock:
+        if _pool is broken:
+            _pool = _new_pool()
+    broken.shutdown(wait=False, cancel_futures=True)
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    global _pool
+    _pool = _new_pool()
+    try:
+        yield
+    finally:
+        _pool.shutdown(cancel_futures=True)
+
+app = FastAPI(title="jobfit resume analyzer", lifespan=lifespan)
+
+def _release(weight: int = 1) -> None:
+    global _pending
+    with _pending_lock:
+        _pending -= weight
+
+class Admission:
+    """Pool capacity reserved by one request; see admit()."""
+
+    def __init__(self, weight: int):
+        self.held = weight
+
+    def hand_off(self, future: Future) -> None:
+        """Release one reserved unit when the pool or batcher task finishes rather than when the request ends."""
+        if self.held <= 0:
+            raise RuntimeError("No reserved capacity left to hand off")
+        self.held -= 1
+        future.add_done_callback(lambda _: _release())
+
+@contextmanager
+def admit(weight: int = 1):
+    """
+    Reserve pool capacity for weight tasks, or reject the request with 429 when it is full.
+
+    Units handed to a task (run_in_pool, /recommend) stay reserved until that task finishes, even
+    after a 504; units never handed off are released when the block exits.
+    """
+    global _pending
+    with _pending_lock:
+        if _pending + weight > config.API_MAX_PENDING:
+            raise HTTPException(status_code=429, detail="Server busy, retry later")
+        _pending += weight
+    admission = Admission(weight)
+    try:
+        yield admission
+    finally:
+        if admission.held:
+            _release(admission.held)
+
+async def await_reserved(admission: Admission, future: Future):
+    """Await a pool or batcher future that holds one reserved unit, mapping a timeout to 504."""
+    admission.hand_off(future)
+    try:
+        # On timeout only the asyncio wrapper is cancelled; a task already running keeps its capacity.
+        return await asyncio.wait_for(asyncio.wrap_future(future), timeout=config.API_TIMEOUT_SECONDS)
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="Analysis timed out")
+
+async def run_in_pool(admission: Admission, func, *args):
+    """Run func in the worker pool under an admit() reservation, mapping bad input to 422 and a dead worker to 503."""
+    pool = _pool
+    try:
+        return await await_reserved(admission, pool.submit(func, *args))
+    except BrokenProcessPool:
+        _replace_broken_pool(pool)
+        raise HTTPException(status_code=503, detail="Worker crashed, retry the request")
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+async def read_upload(upload: UploadFile) -> bytes:
+    """Read an upload in chunks, rejecting it as soon as it passes the size cap."""
+    buffer = bytearray()
+    while True:
+        chunk = await upload.read(UPLOAD_CHUNK_BYTES)
+        if not chunk:
+            break
+        buffer += chunk
+        if len(buffer) > config.API_MAX_UPLOAD_BYTES:
+            raise HTTPException(status_code=413, detail=f"{upload.filename}: file too large")
+    if not buffer:
+        raise HTTPException(status_code=400, detail=f"{upload.filename}: file is empty")
+    return bytes(buffer)
+
+@app.get("/health")
+async def health() -> dict:
+    return {"status": "ok", "pending": _pending}
+
+@app.get("/metrics")
+async def metrics() -> dict:
+    return {"pending": _pending, "recommend_batcher": analyzer.get_recommend_batcher().metrics(),
+            "stages": instrumentation.metrics()}
+
+@app.get("/metrics/prometheus", response_class=PlainTextResponse)
+async def metrics_prometheus() -> str:
+    """Stage timings and counters of the server process (pool workers keep their own)."""
+    return instrumentation.prometheus_text()
+
+@app.post("/parse")
+async def parse(file: UploadFile = File(...)) -> dict:
+    data = await read_upload(file)
+    with admit() as admission:
+        result = await run_in_pool(admission, analyzer.parse_bytes, data, file.filename or "")
+    if result.get("error"):
+        raise HTTPException(status_code=422, detail=result["error"])
+    return result
+
+@app.post("/score")
+async def score(request: ScoreRequest) -> dict:
+    with admit() as admission:
+        return await run_in_pool(admission, analyzer.score, request.text, request.role, request.skills)
+
+@app.post("/recommend")
+async def recommend(request: RecommendRequest) -> dict:
+    # Concurrent requests are coalesced into one vectorized predict by the micro-batcher.
+    with admit() as admission:
+        future = analyzer.get_recommend_batcher().submit((request.text, request.top_n))
+        roles = await await_reserved(admission, future)
+    return {"roles": [{"role": role, "probability": p} for role, p in roles]}
+
+@app.post("/match-jd")
+async def match_jd(request: MatchJDRequest) -> dict:
+    with admit() as admission:
+        return await run_in_pool(admission, analyzer.match_jd, request.resume_text, request.jd_text, request.threshold)
+
+@app.post("/talent-map")
+async def talent_map(request: TalentMapRequest) -> dict:
+    """Place one or many resumes on the talent map in a single vectorized call."""
+    if len(request.texts) > config.API_MAX_PENDING:
+        raise HTTPException(status_code=413, detail=f"At most {config.API_MAX_PENDING} texts per request")
+    with admit() as admission:
+        placements = await run_in_pool(admission, _place_batch, request.texts, request.k)
+    return {"placements": placements}
+
+def _place_batch(texts: List[str], k: int) -> List[dict]:
+    from talent_map import get_talent_map
+    return get_talent_map().place_batch(texts, k=k)
+
+@app.post("/batch")
+async def batch(files: List[UploadFile] = File(...), top_n: int = Form(5)) -> dict:
+    if len(files) > config.API_MAX_PENDING:
+        raise HTTPException(status_code=413, detail=f"At most {config.API_MAX_PENDING} files per batch")
+    uploads = [(await read_upload(f), f.filename or "") for f in files]
+    with admit(len(uploads)) as admission:
+        results = await asyncio.gather(*(run_in_pool(admission, analyzer.analyze_bytes, data, name, top_n)
+                                         for data, name in uploads), return_exceptions=True)
+    return {"results": [result if isinstance(result, dict) else {"error": getattr(result, "detail", str(result))}
+                        for result in results]}
@@ -1,19 +1,16 @@
+import contextlib
 import streamlit as st
 import traceback
+from streamlit.errors import StreamlitAPIException
+
+# Closes the Analyze page's request trace even when rendering fails part-way.
+trace = contextlib.ExitStack()
 try:
     import os
-    from resume_parser import parse_resume
-    from recommender import ResumeRecommender
-    from score_resume import calculate_score, SKILL_KEYWORDS
-    from jd_matcher import match_resume_to_jd
-    from utils import load_pickle_model, render_pdf_as_iframe, save_uploaded_resume
-    import spacy
-    try:
-        spacy.load("en_core_web_sm")
-    except OSError:
-        from spacy.cli import download
-        download("en_core_web_sm")
-        spacy.load("en_core_web_sm")
+    import app_cache
+    import instrumentation
+    from score_resume import SKILL_KEYWORDS
+    from reports import render_html_report, render_pdf_report
 
     st.set_page_config(
         page_title="Smart Resume Analyzer",
@@ -43,8 +40,12 @@ try:
     st.sidebar.title("Navigation")
     page = st.sidebar.radio("Select a page", ["Upload Resume", "Analyze Resume", "Get Recommendations"])
 
-    if "resume_path" not in st.session_state:
-        st.session_state.resume_path = None
+    # The upload stays in memory: a view of its buffer plus the original name (for the file type).
+    if "resume_buffer" not in st.session_state:
+        st.session_state.resume_buffer = None
+        st.session_state.resume_name = None
+        st.session_state.resume_hash = None
+    app_cache.warm_up()
 
     if page == "Upload Resume":
         st.header("Upload Your Resume")
@@ -62,29 +63,41 @@ try:
                 error_message = "Uploaded file is empty. Please select a valid resume."
             else:
 
-                # Save file and parse content
-                save_path = save_uploaded_resume(uploaded_file)
-                st.session_state.resume_path = save_path
+                # Keep the upload in memory; parsing reads the buffer directly
+                st.session_state.resume_buffer = uploaded_file.getbuffer()
+                st.session_state.resume_name = uploaded_file.name
+                # Hashed once per upload; every cached analysis step below is keyed on it
+                st.session_state.resume_hash = app_cache.content_hash(st.session_state.resume_buffer)
                 st.success("Resume uploaded successfully.")
-                st.markdown(render_pdf_as_iframe(save_path), unsafe_allow_html=True)
+                if uploaded_file.name.lower().endswith(".pdf"):
+                    # Served through Streamlit's media endpoint rather than a base64 data URI in the page
+                    if hasattr(st, "pdf"):
+                        try:
+                            st.pdf(uploaded_file)
+                        except (ImportError, StreamlitAPIException):
+                            # The PDF viewer component is an optional extra (streamlit[pdf])
+                            st.info("Install streamlit[pdf] to preview PDFs here; use Open PDF below instead.")
+                    st.download_button("Open PDF", data=uploaded_file, file_name=uploaded_file.name,
+                                       mime="application/pdf")
         if error_message:
             st.error(error_message)
         st.markdown('<div class="section-divider"></div>', unsafe_allow_html=True)
 
     elif page == "Analyze Resume":
         st.header("📊 Resume Analysis & JD Matching")
-        if not st.session_state.resume_path:
+        stages = trace.enter_context(instrumentation.request_trace("analyze_resume"))
+        if st.session_state.resume_buffer is None:
             st.warning("⚠️ Please upload your resume first.")
         else:
+            resume_hash = st.session_state.resume_hash
             with st.spinner("Parsing your resume..."):
-                data = parse_resume(st.session_state.resume_path)
+                data = app_cache.parse(resume_hash, st.session_state.resume_name, st.session_state.resume_buffer)
             if data and data.get("error"):
                 st.error(f"❌ Failed to parse resume: {data['error']}")
             elif data:
                 with st.expander("📄 Extracted Resume Content"):
                     st.json(data)
-                recommender = ResumeRecommender()
-                predicted_roles = recommender.recommend_roles(data.get("text", ""), top_n=10)
+                predicted_roles = app_cache.recommend(resume_hash, 10, data.get("text", ""))
                 st.subheader("🎯 All Role Probabilities")
                 for role, confidence in predicted_roles:
                     st.progress(confidence / 100, text=f"{role}: {confidence}%")
@@ -104,31 +117,23 @@ try:
                 # Custom skill list upload
                 st.markdown("**Optional: Upload your own skill list (TXT or CSV, one skill per line/cell):**")
                 custom_skill_file = st.file_uploader("Upload skill list", type=["txt", "csv"], key="custom_skill_list")
-                custom_skills = None
+                custom_skills, skills_hash = None, None
                 if custom_skill_file:
-                    import pandas as pd
-                    if custom_skill_file.name.endswith(".csv"):
-                        df = pd.read_csv(custom_skill_file, header=None)
-                        custom_skills = df[0].dropna().astype(str).tolist()
-                    else:
-                        custom_skills = [line.strip() for line in custom_skill_file if line.strip()]
-                resume_text = data.get("text", "").lower().strip()
-
+                    skill_bytes = custom_skill_file.getvalue()
+                    skills_hash = app_cache.content_hash(skill_bytes)
+                    custom_skills = app_cache.skill_list(skills_hash, custom_skill_file.name, skill_bytes)
                 # Use custom skills if provided
-                skills_to_use = custom_skills if custom_skills else SKILL_KEYWORDS[selected_field]
-                from score_resume import _skill_in_text
-                matched_keywords = [skill for skill in skills_to_use if _skill_in_text(skill, resume_text)]
-                missing_keywords = [skill for skill in skills_to_use if not _skill_in_text(skill, resume_text)]
+                result = app_cache.score(resume_hash, selected_field, skills_hash, data.get("text", ""),
+                                         custom_skills)
+                matched_keywords, missing_keywords, score = result["matched"], result["missing"], result["score"]
                 st.markdown(f"**Matched Keywords for {selected_field}:**")
                 st.markdown(' '.join([f'<span class="matched-keyword">{kw}</span>' for kw in matched_keywords]), unsafe_allow_html=True)
                 st.markdown(f"**Missing Keywords for {selected_field}:**")
-                st.markdown(' '.join([f'<span class="missing-keyword">{kw}</span>' for kw in missing_keywords]), unsafe_allow_html=True)
-
-                # Score using custom or default skills
-                if custom_skills:
-                    score = round(100 * len(matched_keywords) / len(skills_to_use), 2) if skills_to_use else 0.0
-                else:
-                    score = calculate_score(data.get("text", ""), selected_field)
+                demand = result.get("missing_demand", {})
+                # Ranked by demand when the skill-demand table is built; hover shows how common each one is
+                st.markdown(' '.join([f'<span class="missing-keyword" title="Mentioned in {demand[kw]}% of {selected_field} resumes">{kw}</span>'
+                                      if kw in demand else f'<span class="missing-keyword">{kw}</span>'
+                                      for kw in missing_keywords]), unsafe_allow_html=True)
                 st.markdown('<div class="section-divider"></div>', unsafe_allow_html=True)
                 st.subheader("💯 Resume Score")
                 st.progress(score / 100, text=f"{score}/100")
@@ -136,95 +141,68 @@ try:
                 st.caption("Tip: Add more missing keywords to your resume for a higher score!")
 
                 # Downloadable PDF report
-                from fpdf import FPDF
+                report_args = (selected_field, score, matched_keywords, missing_keywords, predicted_roles)
                 if st.button("Download Analysis Report (PDF)"):
-                    pdf = FPDF()
-                    pdf.add_page()
-                    pdf.set_font("Arial", size=14)
-                    pdf.cell(0, 10, "Resume Analysis Report", ln=True, align="C")
-                    pdf.ln(5)
-                    pdf.set_font("Arial", size=12)
-                    pdf.cell(0, 10, f"Selected Role: {selected_field}", ln=True)
-                    pdf.cell(0, 10, f"Score: {score}/100", ln=True)
-                    pdf.ln(3)
-                    pdf.set_font("Arial", style="B", size=12)
-                    pdf.cell(0, 10, "Matched Keywords:", ln=True)
-                    pdf.set_font("Arial", size=12)
-                    pdf.multi_cell(0, 8, ", ".join(matched_keywords) if matched_keywords else "None")
-                    pdf.set_font("Arial", style="B", size=12)
-                    pdf.cell(0, 10, "Missing Keywords:", ln=True)
-                    pdf.set_font("Arial", size=12)
-                    pdf.multi_cell(0, 8, ", ".join(missing_keywords) if missing_keywords else "None")
-                    pdf.ln(2)
-                    pdf.set_font("Arial", style="B", size=12)
-                    pdf.cell(0, 10, "Role Probabilities:", ln=True)
-                    pdf.set_font("Arial", size=12)
-                    for role, confidence in predicted_roles:
-                        pdf.cell(0, 8, f"{role}: {confidence}%", ln=True)
-                    pdf.ln(2)
-                    pdf.set_font("Arial", style="B", size=12)
-                    pdf.cell(0, 10, "Top Recommendations:", ln=True)
-                    pdf.set_font("Arial", size=12)
-                    for role, confidence in predicted_roles[:3]:
-                        pdf.cell(0, 8, f"{role} ({confidence}%)", ln=True)
-                    import tempfile
-                    with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmpfile:
-                        pdf.output(tmpfile.name)
-                        with open(tmpfile.name, "rb") as f:
-                            st.download_button(
-                                label="Click here to download your PDF report",
-                                data=f.read(),
-                                file_name="resume_analysis_report.pdf",
-                                mime="application/pdf"
-                            )
+                    st.download_button(
+                        label="Click here to download your PDF report",
+                        data=render_pdf_report(*report_args),
+                        file_name="resume_analysis_report.pdf",
+                        mime="application/pdf"
+                    )
                 # Downloadable HTML report
                 if st.button("Download Analysis Report (HTML)"):
-                    html_report = f"""
-                    <h2>Resume Analysis Report</h2>
-                    <h3>Selected Role: {selected_field}</h3>
-                    <p><b>Score:</b> {score}/100</p>
-                    <p><b>Matched Keywords:</b> {', '.join(matched_keywords) if matched_keywords else 'None'}</p>
-                    <p><b>Missing Keywords:</b> {', '.join(missing_keywords) if missing_keywords else 'None'}</p>
-                    <h4>Role Probabilities</h4>
-                    <ul>
-                    {''.join([f'<li>{role}: {confidence}%' for role, confidence in predicted_roles])}
-                    </ul>
-                    <h4>Recommendations</h4>
-                    <ul>
-                    {''.join([f'<li>{role} ({confidence}%)' for role, confidence in predicted_roles[:3]])}
-                    </ul>
-                    """
-                    import base64
-                    b64 = base64.b64encode(html_report.encode()).decode()
-                    href = f'<a href="data:text/html;base64,{b64}" download="resume_analysis_report.html">Click here to download your report</a>'
-                    st.markdown(href, unsafe_allow_html=True)
+                    st.download_button(
+                        label="Click here to download your report",
+                        data=render_html_report(*report_args),
+                        file_name="resume_analysis_report.html",
+                        mime="text/html"
+                    )
                 st.markdown('<div class="section-divider"></div>', unsafe_allow_html=True)
                 jd_input = st.text_area(
                     "📑 Paste a Job Description (Optional)",
                     help="Paste a job description here to see how well your resume matches it."
                 )
                 if jd_input.strip():
-                    match = match_resume_to_jd(data.get("text", ""), jd_input)
+                    match = app_cache.match_jd(resume_hash, app_cache.content_hash(jd_input),
+                                               data.get("text", ""), jd_input)
                     st.success(f"🔗 JD Match Score: {match['similarity_score']}%")
                     st.info(f"🧾 Interpretation: {match['result']}")
+        trace.close()
+        if instrumentation.is_enabled() and stages:
+            with st.expander("🛠 Debug: stage timings"):
+                st.table(stages)
         st.markdown('<div class="section-divider"></div>', unsafe_allow_html=True)
 
     elif page == "Get Recommendations":
         st.header("🧠 AI-Based Job Role Recommendation")
-        if not st.session_state.resume_path:
+        if st.session_state.resume_buffer is None:
             st.warning("⚠️ Please upload your resume first.")
         else:
-            data = parse_resume(st.session_state.resume_path)
+            resume_hash = st.session_state.resume_hash
+            data = app_cache.parse(resume_hash, st.session_state.resume_name, st.session_state.resume_buffer)
             if data and data.get("error"):
                 st.error(f"❌ Failed to parse resume: {data['error']}")
             elif data:
-                recommender = ResumeRecommender()
-                predicted_roles = recommender.recommend_roles(data.get("text", ""), top_n=5)
+                # Same cached top-10 list as the Analyze page
+                predicted_roles = app_cache.recommend(resume_hash, 10, data.get("text", ""))[:5]
                 st.subheader("🎯 Suggested Roles")
                 for role, confidence in predicted_roles:
                     st.success(f"🎯 {role} ({confidence}%)")
                 st.caption("🧠 Based on extracted keywords, technologies, and your experience.")
+                placement = app_cache.place_on_map(resume_hash, data.get("text", ""))
+                if placement["x"] is not None:
+                    import pandas as pd
+                    st.subheader("🗺️ Where You Sit in the Talent Landscape")
+                    landscape = app_cache.talent_map()
+                    points = pd.DataFrame({"x": landscape.coords[:, 0], "y": landscape.coords[:, 1],
+                                           "group": [f"Cluster {c}" for c in landscape.clusters]})
+                    you = pd.DataFrame({"x": [placement["x"]], "y": [placement["y"]], "group": ["You"]})
+                    st.scatter_chart(pd.concat([points, you]), x="x", y="y", color="group")
+                    st.caption(f"Closest to cluster {placement['cluster']}, placed from your "
+                               f"{len(placement['neighbours'])} most similar resumes in the dataset.")
         st.markdown('<div class="section-divider"></div>', unsafe_allow_html=True)
 except Exception as e:
     st.error(f"Startup error: {e}")
-    st.text(traceback.format_exc())
\ No newline at end of file
+    st.text(traceback.format_exc())
+finally:
+    trace.close()
@@ -0,0 +1,70 @@
+"""
+app_cache.py
+
+Streamlit-side caching for the analyzer core. Every widget change reruns the whole app script, so
+each compute step is a pure function cached on explicit keys: the resume content hash, the selected
+role, the custom skill list hash and the job description hash. Bulky inputs are passed as
+underscore-prefixed arguments, which Streamlit leaves out of the cache key. Changing the role
+selectbox then only recomputes the role-dependent score; everything else is a cache hit.
+"""
+import hashlib
+from typing import List, Optional, Sequence, Tuple
+
+import streamlit as st
+
+import analyzer
+
+def content_hash(data) -> str:
+    """sha256 of bytes, a memoryview or text; the cache key for uploads and pasted text."""
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    return hashlib.sha256(data).hexdigest()
+
+@st.cache_resource(show_spinner="Loading models...")
+def warm_up() -> bool:
+    """Load spaCy, the skill matcher and the classifier once per server process."""
+    analyzer.warm_up()
+    return True
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def parse(resume_hash: str, filename: str, _data) -> dict:
+    """Parse the uploaded resume held in memory."""
+    return analyzer.parse_bytes(_data, filename)
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def recommend(resume_hash: str, top_n: int, _text: str) -> List[Tuple[str, float]]:
+    """Top N role recommendations; pages asking for fewer slice the same cached list."""
+    return analyzer.recommend(_text, top_n=top_n)
+
+@st.cache_data(max_entries=256, show_spinner=False)
+def score(resume_hash: str, role: str, skills_hash: Optional[str], _text: str,
+          _skills: Optional[Sequence[str]] = None) -> dict:
+    """Matched/missing keywords and score for one role or custom skill list, from one pass."""
+    return analyzer.score(_text, role, _skills)
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def skill_list(file_hash: str, filename: str, _data: bytes) -> List[str]:
+    """Parse an uploaded skill list (TXT: one per line, CSV: first column)."""
+    if filename.lower().endswith(".csv"):
+        import io
+        import pandas as pd
+        df = pd.read_csv(io.BytesIO(_data), header=None)
+        return df[0].dropna().astype(str).str.strip().tolist()
+    lines = bytes(_data).decode("utf-8", errors="replace").splitlines()
+    return [line.strip() for line in lines if line.strip()]
+
+@st.cache_resource(show_spinner="Loading the talent map...", validate=lambda landscape: landscape.is_current())
+def talent_map():
+    """The shared TalentMap (corpus vectors, centroids, KD-tree), built once per vectorizer per server process."""
+    from talent_map import get_talent_map
+    return get_talent_map()
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def place_on_map(resume_hash: str, _text: str) -> dict:
+    """Where the resume sits on the talent map."""
+    return talent_map().place(_text)
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def match_jd(resume_hash: str, jd_hash: str, _text: str, _jd_text: str) -> dict:
+    """JD similarity and verdict for a resume/job description pair."""
+    return analyzer.match_jd(_text, _jd_text)
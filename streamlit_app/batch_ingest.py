@@ -0,0 +1,296 @@
+"""
+batch_ingest.py
+
+Headless bulk resume screening. Finds resumes in a directory, ZIP archive or CSV export, fans text
+extraction, NER, role recommendation and role scoring out over a process pool, and appends one JSON
+line per resume to the output file as results arrive. Re-running with the same output skips resumes
+that are already done and retries the ones that failed. With --dedup, near-duplicates of an already
+screened resume (dedup.py) are recorded with "duplicate_of" and skip NER, classification and
+scoring. A resume enters the dedup index only once it has been screened successfully; near-duplicates
+of one that fails are recorded as failed too, so the next run retries them.
+
+Usage:
+    python streamlit_app/batch_ingest.py <dir|zip|csv> -o results.jsonl [--workers 8] [--parquet]
+    python streamlit_app/batch_ingest.py <dir|zip|csv> -o results.jsonl --dedup [--dedup-index dedup/]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import zipfile
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+RESUME_EXTENSIONS = (".pdf", ".docx", ".txt")
+
+# (id, file path or None, inline text or None)
+Item = Tuple[str, Optional[str], Optional[str]]
+
+_recommender = None
+
+def _init_worker() -> None:
+    """Load spaCy, the skill matcher and the classifier once per worker process."""
+    global _recommender
+    from recommender import ResumeRecommender
+    from resume_parser import get_nlp
+    from score_resume import get_skill_matcher
+    get_nlp()
+    get_skill_matcher()
+    _recommender = ResumeRecommender()
+
+def process_chunk(items: List[Item], top_n: int = 5) -> List[dict]:
+    """Extract, parse and score a chunk of resumes; failures are reported per item, not raised."""
+    from resume_parser import extract_entities_batch, extract_text_from_file
+    from score_resume import ROLE_NAMES, SKILL_KEYWORDS, match_skills, score_all_roles_batch
+    from skill_demand import rank_missing
+    if _recommender is None:
+        _init_worker()
+    records, texts = [], []
+    for item_id, path, text in items:
+        record = {"id": item_id, "error": ""}
+        if text is None:
+            text = extract_text_from_file(path)
+            if text.startswith("ERROR"):
+                record["error"] = text
+        records.append(record)
+        texts.append("" if record["error"] else text)
+    ok = [i for i, record in enumerate(records) if not record["error"]]
+    if ok:
+        ok_texts = [texts[i] for i in ok]
+        try:
+            entities = extract_entities_batch(ok_texts)
+            roles = _recommender.recommend_roles_batch(ok_texts, top_n=top_n)
+            scores = score_all_roles_batch(ok_texts)
+        except Exception as e:
+            for i in ok:
+                records[i]["error"] = f"ERROR: {e}"
+        else:
+            for n, i in enumerate(ok):
+                entities[n].pop("text", None)
+                records[i]["entities"] = entities[n]
+                records[i]["roles"] = roles[n]
+                records[i]["scores"] = dict(zip(ROLE_NAMES, scores[n].tolist()))
+                # Keyword detail for the best-scoring role, which batch_reports.py renders
+                best_role = ROLE_NAMES[int(scores[n].argmax())]
+                records[i]["best_role"] = best_role
+                matched, missing = match_skills(ok_texts[n], SKILL_KEYWORDS[best_role])
+                records[i]["matched"], records[i]["missing"] = matched, rank_missing(best_role, missing)
+    return records
+
+def extract_chunk(items: List[Item]) -> List[Item]:
+    """Extract text for file items (the cheap first stage when deduplicating)."""
+    from resume_parser import extract_text_from_file
+    extracted = []
+    for item_id, path, text in items:
+        if text is None:
+            text = extract_text_from_file(path)
+            # Keep failures as file items; process_chunk re-extracts and records the error.
+            extracted.append((item_id, path, None) if text.startswith("ERROR") else (item_id, None, text))
+        else:
+            extracted.append((item_id, path, text))
+    return extracted
+
+def _extracted(pool: ProcessPoolExecutor, items: Iterator[Item], chunk_size: int, depth: int) -> Iterator[Item]:
+    """Yield items with text filled in, extracting in the pool with at most depth chunks in flight."""
+    queue: deque = deque()
+    for chunk in _chunks(items, chunk_size):
+        if all(text is not None for _, _, text in chunk):
+            queue.append(chunk)
+        else:
+            queue.append(pool.submit(extract_chunk, chunk))
+        if len(queue) >= depth:
+            head = queue.popleft()
+            yield from head if isinstance(head, list) else head.result()
+    while queue:
+        head = queue.popleft()
+        yield from head if isinstance(head, list) else head.result()
+
+def iter_directory(root: str) -> Iterator[Item]:
+    for dirpath, _, filenames in os.walk(root):
+        for filename in sorted(filenames):
+            if filename.lower().endswith(RESUME_EXTENSIONS):
+                path = os.path.join(dirpath, filename)
+                yield os.path.relpath(path, root), path, None
+
+def iter_csv(path: str, text_column: str) -> Iterator[Item]:
+    import pandas as pd
+    from data_loader import iter_data_file
+    for chunk in iter_data_file(path, [text_column], chunksize=1000):
+        for row_id, text in chunk[text_column].items():
+            yield f"row-{row_id}", None, "" if pd.isna(text) else str(text)
+
+def iter_items(source: str, workdir: str, text_column: str = "Resume") -> Iterator[Item]:
+    """Yield work items for a directory, ZIP archive or CSV file."""
+    if os.path.isdir(source):
+        yield from iter_directory(source)
+    elif source.lower().endswith(".zip"):
+        with zipfile.ZipFile(source) as archive:
+            archive.extractall(workdir)
+        yield from iter_directory(workdir)
+    elif source.lower().endswith(".csv"):
+        yield from iter_csv(source, text_column)
+    else:
+        raise ValueError(f"Unsupported input: {source}")
+
+def load_done_ids(output_path: str) -> Set[str]:
+    """Return the ids an existing JSONL output already holds a result for (for resuming); failures are retried."""
+    done: Set[str] = set()
+    if os.path.isfile(output_path):
+        with open(output_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                    if not record.get("error"):
+                        done.add(record["id"])
+                except (ValueError, KeyError):
+                    continue  # a partially written last line from an interrupted run
+    return done
+
+def _chunks(items: Iterator[Item], size: int) -> Iterator[List[Item]]:
+    chunk: List[Item] = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def run_batch(source: str, output_path: str, workers: Optional[int] = None, chunk_size: int = 16,
+              top_n: int = 5, text_column: str = "Resume", dedup: bool = False,
+              dedup_index: Optional[str] = None) -> dict:
+    """
+    Screen every resume in source and append results to output_path (JSONL).
+
+    Args:
+        dedup (bool): Flag near-duplicates before the expensive stages instead of screening them.
+        dedup_index (str, optional): Directory of a persistent dedup index, so later batches are
+            also checked against resumes screened in earlier ones.
+    Returns:
+        dict: Counts of processed, failed, skipped and duplicate resumes plus elapsed seconds.
+    """
+    workers = workers or os.cpu_count() or 1
+    done = load_done_ids(output_path)
+    stats = {"processed": 0, "failed": 0, "skipped": 0, "duplicates": 0}
+    index = pending = None
+    if dedup or dedup_index:
+        from dedup import DedupIndex
+        index = DedupIndex(dedup_index)
+        # Submitted resumes whose screening has not succeeded (yet); never persisted.
+        pending = DedupIndex(num_perm=index.hasher.num_perm, bands=index.bands, threshold=index.threshold,
+                             seed=index.seed)
+    signatures: Dict[str, object] = {}  # id -> MinHash signature, until its result arrives
+    outcomes: Dict[str, bool] = {}  # finished ids in the pending index -> screened successfully
+    waiting: Dict[str, List[Tuple[str, float]]] = {}  # in-flight id -> [(duplicate id, similarity)]
+    start = time.perf_counter()
+    with tempfile.TemporaryDirectory() as workdir, \
+            open(output_path, "a", encoding="utf-8") as out, \
+            ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+
+        def pending_items() -> Iterator[Item]:
+            for item in iter_items(source, workdir, text_column):
+                if item[0] in done:
+                    stats["skipped"] += 1
+                else:
+                    yield item
+
+        def write_duplicate(item_id: str, original: str, similarity: float, ok: bool = True) -> None:
+            error = "" if ok else f"ERROR: near-duplicate of {original}, which failed"
+            out.write(json.dumps({"id": item_id, "error": error, "duplicate_of": original,
+                                  "similarity": similarity}) + "\n")
+            stats["duplicates" if ok else "failed"] += 1
+
+        def unique_items() -> Iterator[Item]:
+            for item in _extracted(pool, pending_items(), chunk_size, workers * 2):
+                signature = index.hasher.signature(item[2]) if item[2] is not None else None
+                found = index.query(signature)
+                # Matching its own id means it was indexed by an interrupted run before its result was written.
+                if found is not None and found[0] != item[0]:
+                    write_duplicate(item[0], found[0], found[1])
+                    continue
+                found = pending.query(signature)
+                if found is not None and found[0] != item[0]:
+                    if found[0] in outcomes:
+                        write_duplicate(item[0], found[0], found[1], outcomes[found[0]])
+                    else:
+                        waiting.setdefault(found[0], []).append((item[0], found[1]))
+                    continue
+                if signature is not None:
+                    pending.add(item[0], signature)
+                    signatures[item[0]] = signature
+                yield item
+
+        def settle(record: dict) -> None:
+            """Index a screened resume once it succeeded and resolve near-duplicates held back for it."""
+            ok = not record["error"]
+            signature = signatures.pop(record["id"], None)
+            if signature is None:
+                return
+            if ok:
+                index.add(record["id"], signature)
+            outcomes[record["id"]] = ok
+            for item_id, similarity in waiting.pop(record["id"], ()):
+                write_duplicate(item_id, record["id"], similarity, ok)
+
+        in_flight = set()
+        chunks = _chunks(unique_items() if index is not None else pending_items(), chunk_size)
+        exhausted = False
+        while in_flight or not exhausted:
+            # Keep a bounded number of chunks queued so huge inputs are never fully materialized.
+            while not exhausted and len(in_flight) < workers * 2:
+                chunk = next(chunks, None)
+                if chunk is None:
+                    exhausted = True
+                else:
+                    in_flight.add(pool.submit(process_chunk, chunk, top_n))
+            if not in_flight:
+                break
+            finished, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in finished:
+                for record in future.result():
+                    out.write(json.dumps(record) + "\n")
+                    stats["processed"] += 1
+                    stats["failed"] += bool(record["error"])
+                    if index is not None:
+                        settle(record)
+            out.flush()
+            elapsed = time.perf_counter() - start
+            print(f"\r{stats['processed']} processed, {stats['failed']} failed, {stats['skipped']} skipped, "
+                  f"{stats['duplicates']} duplicates ({stats['processed'] / elapsed:.1f}/s)", end="", file=sys.stderr)
+    print(file=sys.stderr)
+    stats["elapsed_seconds"] = round(time.perf_counter() - start, 2)
+    return stats
+
+def jsonl_to_parquet(jsonl_path: str, parquet_path: str) -> None:
+    """Convert the JSONL results to Parquet, keeping each id's latest record (requires pyarrow or fastparquet)."""
+    import pandas as pd
+    # A retried failure appends a second record for its id.
+    df = pd.read_json(jsonl_path, lines=True).drop_duplicates("id", keep="last")
+    for column in ("entities", "roles", "scores", "matched", "missing"):
+        if column in df:
+            df[column] = df[column].map(json.dumps)
+    df.to_parquet(parquet_path, index=False)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Screen a directory, ZIP or CSV of resumes in parallel.")
+    parser.add_argument("source", help="Directory or .zip of PDF/DOCX/TXT resumes, or a .csv with a text column.")
+    parser.add_argument("-o", "--output", default="batch_results.jsonl", help="JSONL output (appended to and resumed).")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count).")
+    parser.add_argument("--chunk-size", type=int, default=16, help="Resumes per worker task.")
+    parser.add_argument("--top-n", type=int, default=5, help="Role recommendations per resume.")
+    parser.add_argument("--text-column", default="Resume", help="Resume text column for CSV input.")
+    parser.add_argument("--parquet", action="store_true", help="Also write <output>.parquet when finished.")
+    parser.add_argument("--dedup", action="store_true", help="Flag near-duplicate resumes instead of screening them.")
+    parser.add_argument("--dedup-index", help="Persistent dedup index directory (implies --dedup).")
+    args = parser.parse_args()
+    stats = run_batch(args.source, args.output, args.workers, args.chunk_size, args.top_n, args.text_column,
+                      args.dedup, args.dedup_index)
+    if args.parquet:
+        jsonl_to_parquet(args.output, os.path.splitext(args.output)[0] + ".parquet")
+    print(json.dumps(stats))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""
+batch_reports.py
+
+Renders PDF/HTML analysis reports for a whole batch of screened resumes (the JSONL written by
+batch_ingest.py) across a process pool. Reports are rendered in memory in the workers and written
+as they arrive, either as entries of one ZIP archive (streamed, so a non-seekable file object such
+as an HTTP response body also works) or as files in a directory. Nothing is left in temp files.
+
+Usage:
+    python streamlit_app/batch_reports.py results.jsonl -o reports.zip [--formats pdf html] [--workers 8]
+    python streamlit_app/batch_reports.py results.jsonl -o reports/
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import BinaryIO, Iterable, Iterator, List, Optional, Sequence, Set, Tuple, Union
+
+FORMATS = ("pdf", "html")
+
+# (record id, format, report bytes or None, error message)
+Rendered = Tuple[str, str, Optional[bytes], str]
+
+def _init_worker() -> None:
+    """Import FPDF and the HTML template once per worker process, not per report."""
+    import fpdf  # noqa: F401
+    import reports  # noqa: F401
+
+def render_record(record: dict, formats: Sequence[str] = FORMATS) -> List[Rendered]:
+    """Render one screened resume's reports; a failure is reported per format, not raised."""
+    from reports import render_html_report, render_pdf_report
+    roles = [tuple(role) for role in record.get("roles", [])]
+    role = record.get("best_role") or (roles[0][0] if roles else "")
+    args = (role, record.get("scores", {}).get(role, 0.0), record.get("matched", []),
+            record.get("missing", []), roles)
+    rendered: List[Rendered] = []
+    for fmt in formats:
+        try:
+            data = render_pdf_report(*args) if fmt == "pdf" else render_html_report(*args).encode("utf-8")
+            rendered.append((record["id"], fmt, data, ""))
+        except Exception as e:
+            rendered.append((record["id"], fmt, None, f"ERROR: {e}"))
+    return rendered
+
+def render_chunk(records: List[dict], formats: Sequence[str] = FORMATS) -> List[Rendered]:
+    return [item for record in records for item in render_record(record, formats)]
+
+def iter_records(jsonl_path: str) -> Iterator[dict]:
+    """Yield successfully screened records from a batch_ingest.py output file."""
+    with open(jsonl_path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # a partially written last line from an interrupted run
+            if not record.get("error") and "roles" in record:
+                yield record
+
+def report_name(record_id: str, fmt: str, used: Set[str]) -> str:
+    """A filesystem/ZIP-safe, unique file name for a record's report."""
+    stem = re.sub(r"[^\w.-]+", "_", os.path.splitext(str(record_id))[0]).strip("._") or "resume"
+    name, n = f"{stem}.{fmt}", 1
+    while name in used:
+        n += 1
+        name = f"{stem}-{n}.{fmt}"
+    used.add(name)
+    return name
+
+def _chunks(records: Iterable[dict], size: int) -> Iterator[List[dict]]:
+    chunk: List[dict] = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def render_reports(records: Iterable[dict], output: Union[str, BinaryIO], formats: Sequence[str] = FORMATS,
+                   workers: Optional[int] = None, chunk_size: int = 8) -> dict:
+    """
+    Render reports for many screened resumes in parallel.
+
+    Args:
+        records (Iterable[dict]): Screened resumes (id, roles, scores, best_role, matched, missing).
+        output (str | BinaryIO): A ".zip" path or writable binary file object (ZIP archive), or a
+            directory path (one file per report).
+        formats (Sequence[str]): Any of "pdf" and "html".
+        workers (int, optional): Worker processes (default: CPU count).
+        chunk_size (int): Records rendered per worker task.
+    Returns:
+        dict: Counts of written and failed reports plus elapsed seconds.
+    """
+    workers = workers or os.cpu_count() or 1
+    stats = {"written": 0, "failed": 0}
+    used: Set[str] = set()
+    start = time.perf_counter()
+    to_zip = not isinstance(output, str) or output.lower().endswith(".zip")
+    if not to_zip:
+        os.makedirs(output, exist_ok=True)
+    archive = zipfile.ZipFile(output, "w", compression=zipfile.ZIP_DEFLATED) if to_zip else None
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+            in_flight = set()
+            chunks = _chunks(records, chunk_size)
+            exhausted = False
+            while in_flight or not exhausted:
+                # Bounded queue: reports are written as they finish instead of piling up in memory.
+                while not exhausted and len(in_flight) < workers * 2:
+                    chunk = next(chunks, None)
+                    if chunk is None:
+                        exhausted = True
+                    else:
+                        in_flight.add(pool.submit(render_chunk, chunk, tuple(formats)))
+                if not in_flight:
+                    break
+                finished, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    for record_id, fmt, data, error in future.result():
+                        if data is None:
+                            stats["failed"] += 1
+                            print(f"\n{record_id} ({fmt}): {error}", file=sys.stderr)
+                            continue
+                        name = report_name(record_id, fmt, used)
+                        if archive is not None:
+                            archive.writestr(name, data)
+                        else:
+                            with open(os.path.join(output, name), "wb") as f:
+                                f.write(data)
+                        stats["written"] += 1
+                elapsed = time.perf_counter() - start
+                print(f"\r{stats['written']} written, {stats['failed']} failed "
+                      f"({stats['written'] / elapsed:.1f}/s)", end="", file=sys.stderr)
+    finally:
+        if archive is not None:
+            archive.close()
+    print(file=sys.stderr)
+    stats["elapsed_seconds"] = round(time.perf_counter() - start, 2)
+    return stats
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Render analysis reports for a batch of screened resumes.")
+    parser.add_argument("results", help="JSONL output of batch_ingest.py.")
+    parser.add_argument("-o", "--output", default="reports.zip", help="A .zip file or an output directory.")
+    parser.add_argument("--formats", nargs="+", choices=FORMATS, default=list(FORMATS))
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count).")
+    parser.add_argument("--chunk-size", type=int, default=8, help="Resumes per worker task.")
+    args = parser.parse_args()
+    stats = render_reports(iter_records(args.results), args.output, args.formats, args.workers, args.chunk_size)
+    print(json.dumps(stats))
+
+if __name__ == "__main__":
+    main()
@@ -3,8 +3,50 @@ config.py
 
 Configuration constants for model paths and other settings for the Streamlit resume analyzer app.
 """
+import os
 
 CLASSIFIER_MODEL_PATH = "../model/classifier.pkl"
 VECTORIZER_PATH = "../model/vectorizer.pkl"
 SCORER_MODEL_PATH = "../model/scorer_model.pkl"
-LABEL_ENCODER_PATH = "../model/label_encoder.pkl"
\ No newline at end of file
+LABEL_ENCODER_PATH = "../model/label_encoder.pkl"
+# Pickle-free classifier bundle (see model_bundle.py); when set, role recommendation loads only this file
+MODEL_BUNDLE_PATH = os.environ.get("JOBFIT_MODEL_BUNDLE") or None
+
+# Parsed-resume cache: in-memory LRU cap and optional SQLite directory for the on-disk tier
+PARSE_CACHE_MAX_BYTES = int(os.environ.get("JOBFIT_PARSE_CACHE_MB", "64")) * 1024 * 1024
+PARSE_CACHE_DIR = os.environ.get("JOBFIT_PARSE_CACHE_DIR") or None
+
+# Parquet caches of dataset files (data_loader.py); unset keeps each cache next to its source file
+DATA_CACHE_DIR = os.environ.get("JOBFIT_DATA_CACHE_DIR") or None
+
+# PDF extraction budgets: pages, characters and wall-clock seconds before extraction stops early
+PDF_MAX_PAGES = int(os.environ.get("JOBFIT_PDF_MAX_PAGES", "50"))
+PDF_MAX_CHARS = int(os.environ.get("JOBFIT_PDF_MAX_CHARS", "200000"))
+PDF_TIMEOUT_SECONDS = float(os.environ.get("JOBFIT_PDF_TIMEOUT", "20"))
+# Worker processes for page-parallel extraction (1 = extract on the calling thread)
+PDF_WORKERS = int(os.environ.get("JOBFIT_PDF_WORKERS", "1"))
+# "auto" prefers pypdfium2 when installed and falls back to PyPDF2; "pypdfium2" or "pypdf2" forces one
+PDF_BACKEND = os.environ.get("JOBFIT_PDF_BACKEND", "auto").lower()
+
+# HTTP service: worker processes, queued-or-running request cap (beyond it -> 429), per-request timeout
+API_WORKERS = int(os.environ.get("JOBFIT_API_WORKERS", str(os.cpu_count() or 1)))
+API_MAX_PENDING = int(os.environ.get("JOBFIT_API_MAX_PENDING", "64"))
+API_TIMEOUT_SECONDS = float(os.environ.get("JOBFIT_API_TIMEOUT", "30"))
+API_MAX_UPLOAD_BYTES = int(os.environ.get("JOBFIT_API_MAX_UPLOAD_MB", "5")) * 1024 * 1024
+
+# Recommendation micro-batching: flush after this many queued requests or this many milliseconds
+RECOMMEND_BATCH_MAX_SIZE = int(os.environ.get("JOBFIT_RECOMMEND_BATCH_SIZE", "64"))
+RECOMMEND_BATCH_MAX_WAIT_MS = float(os.environ.get("JOBFIT_RECOMMEND_BATCH_WAIT_MS", "5"))
+
+# Upload spool (only used when an upload must be persisted): directory, expiry and total size cap
+UPLOAD_SPOOL_DIR = os.environ.get("JOBFIT_UPLOAD_DIR", "/tmp/uploaded_resumes")
+UPLOAD_TTL_SECONDS = float(os.environ.get("JOBFIT_UPLOAD_TTL", "3600"))
+UPLOAD_SPOOL_MAX_BYTES = int(os.environ.get("JOBFIT_UPLOAD_SPOOL_MB", "512")) * 1024 * 1024
+
+# Instrumentation: stage timings/counters (off by default), span logging, slow-request profiling
+INSTRUMENT_ENABLED = os.environ.get("JOBFIT_INSTRUMENT", "0") == "1"
+INSTRUMENT_LOG_SPANS = os.environ.get("JOBFIT_TRACE_LOG", "0") == "1"
+PROFILE_SLOW_MS = float(os.environ.get("JOBFIT_PROFILE_SLOW_MS", "0"))  # 0 disables profiling
+PROFILE_SAMPLE_RATE = float(os.environ.get("JOBFIT_PROFILE_SAMPLE_RATE", "0.1"))
+PROFILE_MODE = os.environ.get("JOBFIT_PROFILE_MODE", "cprofile").lower()  # "cprofile" or "tracemalloc"
+PROFILE_DIR = os.environ.get("JOBFIT_PROFILE_DIR") or None
@@ -0,0 +1,214 @@
+"""
+data_loader.py
+
+Chunked, cached loader for resume datasets (CSV or Excel exports). The first read streams the source
+in bounded chunks, repairs mis-encoded text (UTF-8 decoded as cp1252, e.g. "NaÃ¯ve") and coerces
+Category to a categorical. At the same time it writes a Parquet cache next to the source, or under
+config.DATA_CACHE_DIR. Later reads come from that cache: memory-mapped, columnar (only the requested
+columns are read) and chunked the same way. A cache is valid while the source's size and mtime are
+unchanged. If only the mtime changed, a matching content hash keeps it valid. Reads without encoding
+repair get their own cache file, and every cache file is written to a private temp file first and
+then renamed into place.
+
+The cache needs pyarrow. Without it, every read goes to the source.
+"""
+import hashlib
+import json
+import os
+import re
+import tempfile
+from typing import Iterator, List, Optional, Sequence, Union
+
+import pandas as pd
+
+import config
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+try:
+    import ftfy
+except ImportError:
+    ftfy = None
+
+CATEGORY_COLUMNS = ("Category",)
+DEFAULT_CHUNK_ROWS = 10000
+# Lead bytes of UTF-8 sequences as they look after being decoded as cp1252/latin-1
+_MOJIBAKE_RE = re.compile("[Â-ô][\u0080-¿ŒœŠšŸŽžƒˆ˜–-›€™]")
+
+def repair_text(text: str) -> str:
+    """Undo UTF-8 text that was decoded as cp1252/latin-1; other text is returned unchanged."""
+    if not isinstance(text, str) or not _MOJIBAKE_RE.search(text):
+        return text
+    if ftfy is not None:
+        return ftfy.fix_text(text)
+    for encoding in ("cp1252", "latin-1"):
+        try:
+            return text.encode(encoding).decode("utf-8")
+        except UnicodeError:
+            continue
+    return text
+
+def _normalize(chunk: pd.DataFrame, repair: bool) -> pd.DataFrame:
+    """Repair text columns and strip category labels (categorical dtype is applied on the way out)."""
+    for column in chunk.columns:
+        if chunk[column].dtype == object:
+            values = chunk[column]
+            if repair:
+                suspect = values.str.contains(_MOJIBAKE_RE, na=False)
+                if suspect.any():
+                    values = values.copy()
+                    values[suspect] = values[suspect].map(repair_text)
+            if column in CATEGORY_COLUMNS:
+                values = values.str.strip()
+            chunk[column] = values
+    return chunk
+
+def _as_categories(chunk: pd.DataFrame) -> pd.DataFrame:
+    for column in CATEGORY_COLUMNS:
+        if column in chunk.columns:
+            chunk[column] = chunk[column].astype("category")
+    return chunk
+
+def sniff_encoding(file_path: str, sample_bytes: int = 1 << 20) -> str:
+    """"utf-8" when the first sample_bytes decode as UTF-8, otherwise cp1252."""
+    with open(file_path, "rb") as f:
+        sample = f.read(sample_bytes)
+    try:
+        sample.decode("utf-8")
+    except UnicodeDecodeError as e:
+        if e.start < len(sample) - 4:  # not just a multi-byte character cut off by the sample
+            return "cp1252"
+    return "utf-8"
+
+def _file_hash(file_path: str) -> str:
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def cache_path(file_path: str, repair_encoding: bool = True) -> str:
+    """Where the Parquet cache for a source file lives; each loader option that changes the content gets its own."""
+    directory = config.DATA_CACHE_DIR or os.path.dirname(os.path.abspath(file_path))
+    suffix = "" if repair_encoding else ".raw"
+    return os.path.join(directory, os.path.basename(file_path) + suffix + ".cache.parquet")
+
+def _temp_path(target: str) -> str:
+    """A fresh temporary file next to target, so concurrent writers never share one before os.replace."""
+    fd, tmp = tempfile.mkstemp(prefix=os.path.basename(target) + ".", suffix=".tmp", dir=os.path.dirname(target))
+    os.close(fd)
+    return tmp
+
+def _write_meta(meta_path: str, meta: dict) -> None:
+    tmp = _temp_path(meta_path)
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+    os.replace(tmp, meta_path)
+
+def _cache_is_valid(file_path: str, cached: str, repair: bool) -> bool:
+    meta_path = cached + ".json"
+    if not (os.path.isfile(cached) and os.path.isfile(meta_path)):
+        return False
+    with open(meta_path, "r", encoding="utf-8") as f:
+        meta = json.load(f)
+    st = os.stat(file_path)
+    if meta.get("repair_encoding") != repair or meta.get("size") != st.st_size:
+        return False
+    if meta.get("mtime_ns") == st.st_mtime_ns:
+        return True
+    if meta.get("sha256") != _file_hash(file_path):
+        return False
+    meta["mtime_ns"] = st.st_mtime_ns  # touched but unchanged
+    _write_meta(meta_path, meta)
+    return True
+
+def _read_source(file_path: str, chunksize: int) -> Iterator[pd.DataFrame]:
+    extension = os.path.splitext(file_path)[1].lower()
+    if extension == ".csv":
+        yield from pd.read_csv(file_path, chunksize=chunksize, encoding=sniff_encoding(file_path),
+                               encoding_errors="replace")
+    elif extension in [".xls", ".xlsx"]:
+        # Excel cannot be read incrementally; the cache makes this a one-off cost.
+        df = pd.read_excel(file_path)
+        for start in range(0, len(df), chunksize):
+            yield df.iloc[start:start + chunksize]
+    else:
+        raise ValueError(f"Unsupported file format: {extension}")
+
+def _read_and_cache(file_path: str, chunksize: int, repair: bool, cached: Optional[str]) -> Iterator[pd.DataFrame]:
+    """Stream the source; when cached is set, write each normalized chunk to the Parquet cache too."""
+    writer = schema = None
+    tmp = _temp_path(cached) if cached else None
+    complete = False
+    try:
+        for chunk in _read_source(file_path, chunksize):
+            chunk = _normalize(chunk, repair)
+            if cached:
+                if writer is None:
+                    schema = pa.Schema.from_pandas(chunk, preserve_index=False)
+                    # Later chunks may gain NaNs, so integers are stored as floats and objects as strings
+                    schema = pa.schema([pa.field(f.name, pa.string()) if chunk[f.name].dtype == object
+                                        else pa.field(f.name, pa.float64()) if pa.types.is_integer(f.type) else f
+                                        for f in schema])
+                    writer = pq.ParquetWriter(tmp, schema)
+                writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+            yield chunk
+        complete = True
+    finally:
+        if writer is not None:
+            writer.close()
+        if cached and complete and writer is not None:
+            st = os.stat(file_path)
+            os.replace(tmp, cached)
+            _write_meta(cached + ".json", {"size": st.st_size, "mtime_ns": st.st_mtime_ns,
+                                           "sha256": _file_hash(file_path), "repair_encoding": repair})
+        elif tmp and os.path.exists(tmp):
+            os.remove(tmp)  # an abandoned or failed first read leaves no partial cache
+
+def iter_data_file(file_path: str, columns: Optional[Sequence[str]] = None, chunksize: int = DEFAULT_CHUNK_ROWS,
+                   use_cache: bool = True, repair_encoding: bool = True) -> Iterator[pd.DataFrame]:
+    """
+    Yield a dataset in chunks of at most chunksize rows, so memory stays bounded by one chunk.
+
+    Chunks keep global row numbers as their index. Category columns are categoricals and text is
+    repaired as described in the module docstring.
+    """
+    cached = cache_path(file_path, repair_encoding) if use_cache and pq is not None else None
+    if cached and _cache_is_valid(file_path, cached, repair_encoding):
+        start = 0
+        parquet = pq.ParquetFile(cached, memory_map=True)
+        for batch in parquet.iter_batches(batch_size=chunksize, columns=list(columns) if columns else None):
+            chunk = batch.to_pandas()
+            chunk.index = pd.RangeIndex(start, start + len(chunk))
+            start += len(chunk)
+            yield _as_categories(chunk)
+        return
+    if cached:
+        os.makedirs(os.path.dirname(cached), exist_ok=True)
+    for chunk in _read_and_cache(file_path, chunksize, repair_encoding, cached):
+        yield _as_categories(chunk[list(columns)] if columns else chunk)
+
+def load_data_file(file_path: str, columns: Optional[Sequence[str]] = None, chunksize: Optional[int] = None,
+                   use_cache: bool = True, repair_encoding: bool = True
+                   ) -> Union[pd.DataFrame, Iterator[pd.DataFrame]]:
+    """Load a whole dataset, or an iterator of chunks when chunksize is given (see iter_data_file)."""
+    if chunksize:
+        return iter_data_file(file_path, columns, chunksize, use_cache, repair_encoding)
+    cached = cache_path(file_path, repair_encoding) if use_cache and pq is not None else None
+    if cached and _cache_is_valid(file_path, cached, repair_encoding):
+        return _as_categories(pq.read_table(cached, columns=list(columns) if columns else None,
+                                            memory_map=True).to_pandas())
+    chunks: List[pd.DataFrame] = list(iter_data_file(file_path, columns, DEFAULT_CHUNK_ROWS, use_cache,
+                                                     repair_encoding))
+    if not chunks:
+        return pd.DataFrame(columns=list(columns) if columns else None)
+    # Chunks can carry different category sets; concatenate as text and recategorize once.
+    for chunk in chunks:
+        for column in CATEGORY_COLUMNS:
+            if column in chunk.columns:
+                chunk[column] = chunk[column].astype(object)
+    return _as_categories(pd.concat(chunks))
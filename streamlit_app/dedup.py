@@ -0,0 +1,185 @@
+"""
+dedup.py
+
+Near-duplicate resume detection with MinHash signatures and an LSH banding index. Text is cleaned
+with jd_matcher.clean_text and shingled into word k-grams. Shingle hashes and the MinHash
+permutations are computed with vectorized NumPy. Signatures are split into bands, and two resumes
+become candidates when any band matches exactly. A candidate is confirmed when the estimated
+Jaccard similarity reaches the threshold.
+
+The index can be persisted to a directory. Signatures and ids are append-only files, so new resumes
+are added without rewriting what is already there.
+"""
+import json
+import os
+import threading
+import zlib
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from jd_matcher import clean_text
+
+MERSENNE_PRIME = np.uint64(4294967291)  # largest prime below 2**32, so a * x + b fits in uint64
+DEFAULT_NUM_PERM = 128
+# 16 bands x 8 rows: a pair becomes a candidate with probability 1 - (1 - s**8)**16, i.e. ~0.61 at
+# Jaccard 0.7, ~0.95 at 0.8 and >0.999 at the 0.9 threshold.
+DEFAULT_BANDS = 16
+DEFAULT_THRESHOLD = 0.9
+SHINGLE_SIZE = 5
+
+def shingle_hashes(text: str, k: int = SHINGLE_SIZE) -> np.ndarray:
+    """Unique 32-bit hashes of the cleaned text's word k-grams (one k-gram for shorter texts)."""
+    words = clean_text(text or "").split()
+    if not words:
+        return np.empty(0, dtype=np.uint64)
+    word_hashes = np.fromiter((zlib.crc32(w.encode("utf-8")) for w in words), dtype=np.uint64, count=len(words))
+    k = min(k, len(words))
+    n = len(words) - k + 1
+    combined = np.zeros(n, dtype=np.uint64)
+    with np.errstate(over="ignore"):  # wrap-around multiplication is the intended mixing
+        for j in range(k):
+            combined = combined * np.uint64(1000003) + word_hashes[j:j + n]
+    return np.unique((combined ^ (combined >> np.uint64(32))) & np.uint64(0xFFFFFFFF))
+
+class MinHasher:
+    """num_perm universal hash functions (a * x + b) mod p, applied to all shingles at once."""
+
+    def __init__(self, num_perm: int = DEFAULT_NUM_PERM, seed: int = 1):
+        rng = np.random.default_rng(seed)
+        p = int(MERSENNE_PRIME)
+        self.num_perm = num_perm
+        self.a = rng.integers(1, p, size=num_perm, dtype=np.uint64)[:, None]
+        self.b = rng.integers(0, p, size=num_perm, dtype=np.uint64)[:, None]
+
+    def signature(self, text: str) -> Optional[np.ndarray]:
+        """MinHash signature (num_perm uint32 values), or None for text without words."""
+        shingles = shingle_hashes(text)
+        if shingles.size == 0:
+            return None
+        return ((self.a * shingles[None, :] + self.b) % MERSENNE_PRIME).min(axis=1).astype(np.uint32)
+
+class DedupIndex:
+    """LSH banding index over MinHash signatures, optionally persisted to an append-only directory."""
+
+    def __init__(self, path: Optional[str] = None, num_perm: int = DEFAULT_NUM_PERM, bands: int = DEFAULT_BANDS,
+                 threshold: float = DEFAULT_THRESHOLD, seed: int = 1):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.path = path
+        self.threshold = threshold
+        self._lock = threading.Lock()
+        self._ids: List[Hashable] = []
+        self._signatures: List[np.ndarray] = []
+        if path and os.path.isfile(os.path.join(path, "meta.json")):
+            with open(os.path.join(path, "meta.json"), "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            num_perm, bands, seed = meta["num_perm"], meta["bands"], meta["seed"]
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.hasher = MinHasher(num_perm, seed)
+        self.seed = seed
+        self._buckets: List[Dict[bytes, List[int]]] = [{} for _ in range(bands)]
+        if path:
+            self._load()
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        return [signature[i * self.rows:(i + 1) * self.rows].tobytes() for i in range(self.bands)]
+
+    def _insert(self, doc_id: Hashable, signature: np.ndarray) -> None:
+        position = len(self._ids)
+        self._ids.append(doc_id)
+        self._signatures.append(signature)
+        for band, key in enumerate(self._band_keys(signature)):
+            self._buckets[band].setdefault(key, []).append(position)
+
+    def _load(self) -> None:
+        sig_path = os.path.join(self.path, "signatures.u32")
+        ids_path = os.path.join(self.path, "ids.jsonl")
+        if not os.path.isfile(sig_path):
+            return
+        with open(ids_path, "r", encoding="utf-8") as f:
+            ids = [json.loads(line) for line in f if line.strip()]
+        signatures = np.fromfile(sig_path, dtype=np.uint32)
+        n = min(len(ids), signatures.size // self.hasher.num_perm)  # ignore a torn final append
+        for doc_id, signature in zip(ids[:n], signatures[:n * self.hasher.num_perm].reshape(n, -1)):
+            self._insert(doc_id, signature)
+
+    def _append(self, doc_id: Hashable, signature: np.ndarray) -> None:
+        os.makedirs(self.path, exist_ok=True)
+        meta_path = os.path.join(self.path, "meta.json")
+        if not os.path.isfile(meta_path):
+            with open(meta_path, "w", encoding="utf-8") as f:
+                json.dump({"num_perm": self.hasher.num_perm, "bands": self.bands, "seed": self.seed}, f)
+        with open(os.path.join(self.path, "signatures.u32"), "ab") as f:
+            f.write(signature.tobytes())
+        with open(os.path.join(self.path, "ids.jsonl"), "a", encoding="utf-8") as f:
+            f.write(json.dumps(doc_id) + "\n")
+
+    def _query(self, signature: np.ndarray) -> Optional[Tuple[Hashable, float]]:
+        """query() without the lock; callers hold self._lock."""
+        candidates = set()
+        for band, key in enumerate(self._band_keys(signature)):
+            candidates.update(self._buckets[band].get(key, ()))
+        if not candidates:
+            return None
+        positions = sorted(candidates)
+        similarity = (np.stack([self._signatures[i] for i in positions]) == signature).mean(axis=1)
+        best = int(np.argmax(similarity))
+        if similarity[best] < self.threshold:
+            return None
+        return self._ids[positions[best]], round(float(similarity[best]), 3)
+
+    def _add(self, doc_id: Hashable, signature: np.ndarray) -> None:
+        """add() without the lock; callers hold self._lock."""
+        self._insert(doc_id, signature)
+        if self.path:
+            self._append(doc_id, signature)
+
+    def query(self, signature: Optional[np.ndarray]) -> Optional[Tuple[Hashable, float]]:
+        """Return (id, estimated Jaccard) of the most similar indexed resume at or above the threshold."""
+        if signature is None:
+            return None
+        with self._lock:
+            return self._query(signature)
+
+    def add(self, doc_id: Hashable, signature: Optional[np.ndarray]) -> None:
+        """Index a signature (persisted immediately when the index has a path)."""
+        if signature is None:
+            return
+        with self._lock:
+            self._add(doc_id, signature)
+
+    def check_and_add(self, doc_id: Hashable, text: str) -> Optional[Tuple[Hashable, float]]:
+        """
+        Return (original id, similarity) if text near-duplicates an indexed resume; otherwise index it.
+
+        The lookup and the insert happen under one lock, so two concurrent near-duplicates cannot both
+        miss each other and both be indexed.
+
+        Args:
+            doc_id (Hashable): JSON-serializable id for the resume.
+            text (str): Raw resume text.
+        """
+        signature = self.hasher.signature(text)
+        if signature is None:
+            return None
+        with self._lock:
+            duplicate = self._query(signature)
+            if duplicate is None:
+                self._add(doc_id, signature)
+        return duplicate
+
+def find_near_duplicates(items: Iterable[Tuple[Hashable, str]], threshold: float = DEFAULT_THRESHOLD
+                         ) -> Dict[Hashable, Hashable]:
+    """Map each near-duplicate id to the first-seen id it duplicates, in one streaming pass."""
+    index = DedupIndex(threshold=threshold)
+    duplicates: Dict[Hashable, Hashable] = {}
+    for doc_id, text in items:
+        found = index.check_and_add(doc_id, text)
+        if found is not None:
+            duplicates[doc_id] = found[0]
+    return duplicates
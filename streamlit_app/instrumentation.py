@@ -0,0 +1,237 @@
+"""
+instrumentation.py
+
+Lightweight timing spans and counters for the hot path (parsing, scoring, recommendation, JD
+matching). Disabled by default: an instrumented call then costs one flag check. When enabled
+(JOBFIT_INSTRUMENT=1 or enable()), per-stage latency histograms and counters are kept in process and
+exported as Prometheus text; spans can also be logged as OpenTelemetry-shaped JSON records, and
+slow requests can be sampled with cProfile or tracemalloc.
+"""
+import bisect
+import contextvars
+import cProfile
+import functools
+import io
+import json
+import logging
+import os
+import pstats
+import random
+import secrets
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+import config
+
+# Latency bucket upper bounds in seconds (Prometheus-style, cumulative on export).
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+trace_logger = logging.getLogger("jobfit.trace")
+profile_logger = logging.getLogger("jobfit.profile")
+
+class Histogram:
+    """Fixed-bucket counter with a running sum, cheap enough to update on every call."""
+
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.total = 0.0
+        self.n = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.total += value
+        self.n += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        labels = [f"<={b:g}" for b in self.bounds] + [f">{self.bounds[-1]:g}"]
+        return {"buckets": dict(zip(labels, self.counts)), "count": self.n,
+                "mean": round(self.total / self.n, 3) if self.n else 0.0}
+
+class _State:
+    enabled = config.INSTRUMENT_ENABLED
+    log_spans = config.INSTRUMENT_LOG_SPANS
+
+_lock = threading.Lock()
+_stage_seconds: Dict[str, Histogram] = {}
+_counters: Dict[str, float] = {}
+# (trace_id, span_id, per-request stage list or None) of the enclosing span
+_current: contextvars.ContextVar = contextvars.ContextVar("jobfit_span", default=None)
+
+def enable(on: bool = True, log_spans: Optional[bool] = None) -> None:
+    """Switch instrumentation on or off at runtime."""
+    _State.enabled = on
+    if log_spans is not None:
+        _State.log_spans = log_spans
+
+def is_enabled() -> bool:
+    return _State.enabled
+
+def count(name: str, value: float = 1) -> None:
+    """Add value to a named counter (e.g. document characters, pages, keyword matches)."""
+    if not _State.enabled:
+        return
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + value
+
+@contextmanager
+def span(name: str, **attributes) -> Iterator[None]:
+    """Time a block as a stage; nested spans share the enclosing trace."""
+    if not _State.enabled:
+        yield
+        return
+    parent = _current.get()
+    trace_id = parent[0] if parent else secrets.token_hex(16)
+    span_id = secrets.token_hex(8)
+    stages = parent[2] if parent else None
+    token = _current.set((trace_id, span_id, stages))
+    start_ns = time.time_ns()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        _current.reset(token)
+        _record(name, elapsed, start_ns, trace_id, span_id, parent, stages, attributes)
+
+def _record(name: str, elapsed: float, start_ns: int, trace_id: str, span_id: str, parent, stages,
+            attributes: Dict[str, Any]) -> None:
+    """Observe a finished span in the histograms, the request's stage list and the span log."""
+    with _lock:
+        _stage_seconds.setdefault(name, Histogram(LATENCY_BUCKETS)).observe(elapsed)
+    if stages is not None:
+        stages.append({"stage": name, "ms": round(elapsed * 1000, 3), **attributes})
+    if _State.log_spans:
+        trace_logger.info(json.dumps({
+            "name": name, "trace_id": trace_id, "span_id": span_id,
+            "parent_span_id": parent[1] if parent else None,
+            "start_time_unix_nano": start_ns, "end_time_unix_nano": start_ns + int(elapsed * 1e9),
+            "attributes": attributes,
+        }))
+
+def timed_iter(name: str, iterable: Iterable, **attributes) -> Iterator:
+    """
+    Time producing the items of a lazy iterable (e.g. PDF pages) as one stage.
+
+    Only the time spent inside next() counts, so work the consumer does between items stays in its
+    own stages. The stage is recorded once, when the iterable is exhausted or closed.
+    """
+    if not _State.enabled:
+        yield from iterable
+        return
+    parent = _current.get()
+    trace_id = parent[0] if parent else secrets.token_hex(16)
+    stages = parent[2] if parent else None
+    start_ns = time.time_ns()
+    elapsed = 0.0
+    iterator = iter(iterable)
+    try:
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                elapsed += time.perf_counter() - start
+            yield item
+    finally:
+        close = getattr(iterator, "close", None)
+        if close is not None:
+            close()
+        _record(name, elapsed, start_ns, trace_id, secrets.token_hex(8), parent, stages, attributes)
+
+def timed(name: str):
+    """Decorator form of span(); the wrapper only checks a flag while instrumentation is off."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _State.enabled:
+                return func(*args, **kwargs)
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+@contextmanager
+def request_trace(name: str = "request") -> Iterator[List[dict]]:
+    """
+    Collect a per-request stage breakdown (list of {"stage", "ms"}) for everything timed inside.
+
+    Sampled requests (config.PROFILE_SAMPLE_RATE) slower than config.PROFILE_SLOW_MS are profiled with
+    cProfile or tracemalloc (config.PROFILE_MODE) and the report is logged to "jobfit.profile".
+    """
+    stages: List[dict] = []
+    if not _State.enabled:
+        yield stages
+        return
+    token = _current.set((secrets.token_hex(16), None, stages))
+    profiler = None
+    started_tracemalloc = False
+    sampled = config.PROFILE_SLOW_MS > 0 and random.random() < config.PROFILE_SAMPLE_RATE
+    if sampled and config.PROFILE_MODE == "tracemalloc":
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            started_tracemalloc = True
+    elif sampled:
+        profiler = cProfile.Profile()
+        profiler.enable()
+    start = time.perf_counter()
+    try:
+        with span(name):
+            yield stages
+    finally:
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        if profiler is not None:
+            profiler.disable()
+        _current.reset(token)
+        if sampled and elapsed_ms >= config.PROFILE_SLOW_MS:
+            _report_slow(name, elapsed_ms, profiler)
+        if started_tracemalloc:
+            tracemalloc.stop()
+
+def _report_slow(name: str, elapsed_ms: float, profiler: Optional[cProfile.Profile]) -> None:
+    if profiler is not None:
+        out = io.StringIO()
+        pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(25)
+        report = out.getvalue()
+    else:
+        top = tracemalloc.take_snapshot().statistics("lineno")[:25]
+        report = "\n".join(str(stat) for stat in top)
+    profile_logger.warning("slow %s (%.1f ms)\n%s", name, elapsed_ms, report)
+    if config.PROFILE_DIR:
+        os.makedirs(config.PROFILE_DIR, exist_ok=True)
+        path = os.path.join(config.PROFILE_DIR, f"{name}-{int(time.time() * 1000)}.txt")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(report)
+
+def metrics() -> Dict[str, Any]:
+    """Return per-stage latency histograms (seconds) and counters."""
+    with _lock:
+        return {"stages": {name: h.snapshot() for name, h in _stage_seconds.items()}, "counters": dict(_counters)}
+
+def prometheus_text() -> str:
+    """Render stage latencies and counters in the Prometheus text exposition format."""
+    lines = ["# TYPE jobfit_stage_seconds histogram"]
+    with _lock:
+        for name, h in sorted(_stage_seconds.items()):
+            cumulative = 0
+            for bound, n in zip(h.bounds, h.counts):
+                cumulative += n
+                lines.append(f'jobfit_stage_seconds_bucket{{stage="{name}",le="{bound:g}"}} {cumulative}')
+            lines.append(f'jobfit_stage_seconds_bucket{{stage="{name}",le="+Inf"}} {h.n}')
+            lines.append(f'jobfit_stage_seconds_sum{{stage="{name}"}} {h.total:.6f}')
+            lines.append(f'jobfit_stage_seconds_count{{stage="{name}"}} {h.n}')
+        for name, value in sorted(_counters.items()):
+            lines.append(f"# TYPE jobfit_{name}_total counter")
+            lines.append(f"jobfit_{name}_total {value:g}")
+    return "\n".join(lines) + "\n"
+
+def reset() -> None:
+    """Clear all histograms and counters."""
+    with _lock:
+        _stage_seconds.clear()
+        _counters.clear()
@@ -1,11 +1,29 @@
 """
 jd_matcher.py
 
-Provides functions to match a resume to a job description using TF-IDF cosine similarity.
+Provides functions to match a resume to a job description using TF-IDF cosine similarity. Texts are
+vectorized with a vectorizer fitted once (the shipped vectorizer.pkl, or one fitted on a resume
+corpus), so one JD can be ranked against a whole resume pool with a single sparse matrix product.
+vectorizer.pkl is hot-reloaded through the model registry, so cached vectors are tied to the
+vectorizer object that produced them and an indexed pool is always queried with its own vectorizer.
 """
+import hashlib
+import os
+import pickle
 import re
-from sklearn.metrics.pairwise import cosine_similarity
+import threading
+from collections import OrderedDict
+from typing import Hashable, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from scipy import sparse
 from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.preprocessing import normalize
+
+from instrumentation import timed
+from model_registry import load_model, model_fingerprint
+
+DEFAULT_VECTORIZER_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "model", "vectorizer.pkl"))
 
 def clean_text(text: str) -> str:
     """Lowercase, remove special characters, and extra spaces from text."""
@@ -14,13 +32,135 @@ def clean_text(text: str) -> str:
     text = re.sub(r'\s+', ' ', text).strip()
     return text
 
+def top_k_indices(scores: np.ndarray, top_k: int) -> np.ndarray:
+    """Indices of the top_k scores, highest first."""
+    k = min(top_k, scores.shape[0])
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+    top = np.argpartition(-scores, k - 1)[:k]
+    return top[np.argsort(-scores[top], kind="stable")]
+
+class JDMatcher:
+    """Rank resumes against job descriptions with a pre-fitted TF-IDF vectorizer."""
+
+    def __init__(self, vectorizer=None, vectorizer_path: Optional[str] = None, jd_cache_size: int = 256):
+        self._vectorizer = vectorizer
+        self.vectorizer_path = vectorizer_path or DEFAULT_VECTORIZER_PATH
+        self.jd_cache_size = jd_cache_size
+        # (id(vectorizer), text hash) -> (vectorizer, vector); holding the vectorizer keeps its id from being reused.
+        self._jd_cache: "OrderedDict[Tuple[int, str], Tuple[object, sparse.csr_matrix]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._resume_matrix: Optional[sparse.csr_matrix] = None
+        self._resume_vectorizer = None
+        self._resume_ids: List[Hashable] = []
+        self._fingerprint: Optional[str] = None
+
+    @classmethod
+    def from_corpus(cls, resume_texts: Iterable[str], **kwargs) -> "JDMatcher":
+        """Fit a fresh TF-IDF vectorizer on a resume corpus and index that corpus."""
+        texts = [clean_text(text or "") for text in resume_texts]
+        vectorizer = TfidfVectorizer(stop_words='english', sublinear_tf=True)
+        matrix = vectorizer.fit_transform(texts)
+        matcher = cls(vectorizer=vectorizer, **kwargs)
+        matcher._resume_matrix = normalize(matrix.tocsr())
+        matcher._resume_vectorizer = vectorizer
+        matcher._resume_ids = list(range(len(texts)))
+        return matcher
+
+    @property
+    def vectorizer(self):
+        if self._vectorizer is not None:
+            return self._vectorizer
+        return load_model(self.vectorizer_path)
+
+    def fingerprint(self) -> str:
+        """Content hash of the vectorizer: sha256 of vectorizer.pkl, or of an in-memory vectorizer's pickle."""
+        if self._vectorizer is None:
+            return model_fingerprint(self.vectorizer_path)
+        if self._fingerprint is None:
+            self._fingerprint = hashlib.sha256(pickle.dumps(self._vectorizer)).hexdigest()
+        return self._fingerprint
+
+    def transform(self, texts: Iterable[str], vectorizer=None) -> sparse.csr_matrix:
+        """Vectorize texts into L2-normalized rows, so a dot product is the cosine similarity.
+
+        Pass vectorizer to match vectors made earlier (default: the current one).
+        """
+        vectorizer = vectorizer or self.vectorizer
+        return normalize(vectorizer.transform([clean_text(text or "") for text in texts]).tocsr())
+
+    def jd_vector(self, jd_text: str, vectorizer=None) -> sparse.csr_matrix:
+        """Return the (cached) 1 x V vector for a job description, keyed by the vectorizer and its cleaned text."""
+        vectorizer = vectorizer or self.vectorizer
+        key = (id(vectorizer), hashlib.sha256(clean_text(jd_text or "").encode("utf-8")).hexdigest())
+        with self._lock:
+            cached = self._jd_cache.get(key)
+            if cached is not None:
+                self._jd_cache.move_to_end(key)
+                return cached[1]
+        vector = self.transform([jd_text], vectorizer)
+        with self._lock:
+            self._jd_cache[key] = (vectorizer, vector)
+            while len(self._jd_cache) > self.jd_cache_size:
+                self._jd_cache.popitem(last=False)
+        return vector
+
+    def index_resumes(self, resume_texts: Sequence[str], ids: Optional[Sequence[Hashable]] = None) -> None:
+        """Vectorize and keep the resume pool that rank_resumes() searches."""
+        ids = list(ids) if ids is not None else list(range(len(resume_texts)))
+        if len(ids) != len(resume_texts):
+            raise ValueError("ids and resume_texts must have the same length")
+        vectorizer = self.vectorizer
+        self._resume_matrix = self.transform(resume_texts, vectorizer)
+        self._resume_vectorizer = vectorizer
+        self._resume_ids = ids
+
+    def rank_resumes(self, jd_text: str, top_k: int = 10) -> List[Tuple[Hashable, float]]:
+        """
+        Rank the indexed resume pool against one job description, vectorized like the pool was.
+
+        Args:
+            jd_text (str): Job description text.
+            top_k (int): Number of resumes to return.
+        Returns:
+            List[Tuple[Hashable, float]]: [(resume_id, similarity %), ...], best match first.
+        """
+        if self._resume_matrix is None:
+            raise RuntimeError("No resumes indexed; call index_resumes() first")
+        scores = (self._resume_matrix @ self.jd_vector(jd_text, self._resume_vectorizer).T).toarray().ravel()
+        return [(self._resume_ids[i], round(float(scores[i]) * 100, 2)) for i in top_k_indices(scores, top_k)]
+
+    def rank_jds(self, resume_text: str, jd_texts: Sequence[str], top_k: int = 10) -> List[Tuple[int, float]]:
+        """Rank many job descriptions against one resume; returns [(jd_index, similarity %), ...]."""
+        if not jd_texts:
+            return []
+        vectorizer = self.vectorizer
+        jd_matrix = sparse.vstack([self.jd_vector(jd, vectorizer) for jd in jd_texts]).tocsr()
+        scores = (jd_matrix @ self.transform([resume_text], vectorizer).T).toarray().ravel()
+        return [(int(i), round(float(scores[i]) * 100, 2)) for i in top_k_indices(scores, top_k)]
+
+    def similarity(self, resume_text: str, jd_text: str) -> float:
+        """Cosine similarity between one resume and one job description (as a percentage)."""
+        vectorizer = self.vectorizer
+        score = (self.transform([resume_text], vectorizer) @ self.jd_vector(jd_text, vectorizer).T).toarray()[0, 0]
+        return round(float(score) * 100, 2)
+
+_matcher: Optional[JDMatcher] = None
+_matcher_lock = threading.Lock()
+
+def get_jd_matcher() -> JDMatcher:
+    """Return the shared matcher backed by the shipped vectorizer.pkl."""
+    global _matcher
+    if _matcher is None:
+        with _matcher_lock:
+            if _matcher is None:
+                _matcher = JDMatcher()
+    return _matcher
+
+@timed("tfidf_similarity")
 def get_tfidf_similarity(resume_text: str, job_description: str) -> float:
     """Calculate TF-IDF cosine similarity between resume and job description (as a percentage)."""
-    texts = [clean_text(resume_text), clean_text(job_description)]
-    vectorizer = TfidfVectorizer(stop_words='english')
-    tfidf_matrix = vectorizer.fit_transform(texts)
-    similarity = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])[0][0]
-    return round(similarity * 100, 2)
+    return get_jd_matcher().similarity(resume_text, job_description)
 
 def match_resume_to_jd(resume_text: str, jd_text: str, threshold: float = 50) -> dict:
     """Return similarity score and match result for resume vs. job description."""
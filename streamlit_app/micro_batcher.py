@@ -0,0 +1,97 @@
+"""
+micro_batcher.py
+
+In-process micro-batching for vectorized inference. Callers from any thread (or coroutine) submit
+single items; a background thread gathers them until max_batch_size items are queued or the oldest
+has waited max_wait_ms, runs one batch function over all of them and resolves each caller's future.
+Batch sizes and queue waits are recorded in histograms for tuning throughput against latency.
+"""
+import asyncio
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional
+
+from instrumentation import Histogram
+
+# Histogram bucket upper bounds (inclusive); the last bucket counts everything larger.
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256)
+WAIT_MS_BUCKETS = (0.5, 1, 2, 5, 10, 25, 50, 100, 250)
+
+class MicroBatcher:
+    """
+    Coalesce concurrent single-item calls into batched calls of batch_fn.
+
+    Args:
+        batch_fn (Callable[[List[Any]], List[Any]]): Maps a list of items to a list of results, in order.
+            If the result count differs from the item count, every future in the batch fails with ValueError.
+        max_batch_size (int): Run as soon as this many items are queued.
+        max_wait_ms (float): Run once the oldest queued item has waited this long.
+    """
+
+    def __init__(self, batch_fn: Callable[[List[Any]], List[Any]], max_batch_size: int = 64,
+                 max_wait_ms: float = 5.0, name: str = "micro-batcher"):
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue: "queue.Queue" = queue.Queue()
+        self._lock = threading.Lock()
+        self._batch_sizes = Histogram(BATCH_SIZE_BUCKETS)
+        self._wait_ms = Histogram(WAIT_MS_BUCKETS)
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def submit(self, item: Any) -> Future:
+        """Queue one item and return a Future for its result."""
+        future: Future = Future()
+        self._queue.put((item, future, time.perf_counter()))
+        return future
+
+    def __call__(self, item: Any, timeout: Optional[float] = None) -> Any:
+        """Blocking call from a thread."""
+        return self.submit(item).result(timeout=timeout)
+
+    async def submit_async(self, item: Any) -> Any:
+        """Awaitable call from asyncio code."""
+        return await asyncio.wrap_future(self.submit(item))
+
+    def _collect(self) -> List[tuple]:
+        batch = [self._queue.get()]
+        deadline = batch[0][2] + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._collect()
+            # Callers that gave up (cancelled futures) are dropped before running the batch.
+            batch = [entry for entry in batch if entry[1].set_running_or_notify_cancel()]
+            if not batch:
+                continue
+            started = time.perf_counter()
+            with self._lock:
+                self._batch_sizes.observe(len(batch))
+                for _, _, queued_at in batch:
+                    self._wait_ms.observe((started - queued_at) * 1000)
+            try:
+                results = list(self.batch_fn([item for item, _, _ in batch]))
+                if len(results) != len(batch):
+                    # Results can no longer be matched to callers, so none of them is trusted.
+                    raise ValueError(f"batch_fn returned {len(results)} results for {len(batch)} items")
+            except Exception as e:
+                for _, future, _ in batch:
+                    future.set_exception(e)
+                continue
+            for (_, future, _), result in zip(batch, results):
+                future.set_result(result)
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Return the batch-size and queue-wait (ms) histograms."""
+        with self._lock:
+            return {"batch_size": self._batch_sizes.snapshot(), "queue_wait_ms": self._wait_ms.snapshot()}
@@ -0,0 +1,257 @@
+"""
+model_bundle.py
+
+Compact, pickle-free format for the role classifier. export_bundle() flattens the fitted TF-IDF
+vectorizer (sorted vocabulary array, IDF weights, tokenizer settings), the linear classifier
+(coefficients, intercepts) and the label names into one versioned binary file. ModelBundle
+memory-maps that file and runs transform + predict_proba with plain NumPy, so the request path
+neither imports scikit-learn nor unpickles anything, and worker processes share the pages.
+
+File layout: MAGIC, a little-endian uint32 header length, a JSON header (settings plus
+name -> dtype/shape/offset of each array), then the raw arrays, each aligned to ALIGN bytes.
+
+Usage:
+    python streamlit_app/model_bundle.py                   # export model/*.pkl -> model/classifier_bundle.bin
+    python streamlit_app/model_bundle.py --verify-data data/UpdatedResumeDataSet.csv
+"""
+import argparse
+import json
+import os
+import re
+import struct
+import unicodedata
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+MODEL_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "model"))
+DEFAULT_BUNDLE_PATH = os.path.join(MODEL_DIR, "classifier_bundle.bin")
+MAGIC = b"JOBFITMB"
+FORMAT_VERSION = 1
+ALIGN = 64
+
+def _strip_accents(text: str, mode: Optional[str]) -> str:
+    if mode == "ascii":
+        return unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii")
+    if mode == "unicode":
+        return "".join(c for c in unicodedata.normalize("NFKD", text) if not unicodedata.combining(c))
+    return text
+
+def _proba_kind(classifier) -> str:
+    """How predict_proba turns decision values into probabilities ("softmax" or "ovr")."""
+    name = type(classifier).__name__
+    if name == "LogisticRegression":
+        multi_class = getattr(classifier, "multi_class", "auto")
+        ovr = multi_class in ("ovr", "warn") or (
+            multi_class in ("auto", "deprecated")
+            and (len(classifier.classes_) <= 2 or classifier.solver == "liblinear"))
+        return "ovr" if ovr else "softmax"
+    if name == "SGDClassifier" and classifier.loss in ("log_loss", "log"):
+        return "ovr"
+    raise ValueError(f"Cannot export {name}: only logistic-loss linear classifiers are supported")
+
+def _vectorizer_settings(vectorizer) -> dict:
+    if not hasattr(vectorizer, "vocabulary_"):
+        raise ValueError(f"Cannot export {type(vectorizer).__name__}: a fitted vocabulary is required "
+                         "(hashing vectorizers are not supported)")
+    if vectorizer.analyzer != "word" or vectorizer.tokenizer is not None or vectorizer.preprocessor is not None:
+        raise ValueError("Cannot export a vectorizer with a custom analyzer, tokenizer or preprocessor")
+    stop_words = vectorizer.get_stop_words()
+    return {
+        "lowercase": bool(vectorizer.lowercase),
+        "strip_accents": vectorizer.strip_accents,
+        "token_pattern": vectorizer.token_pattern,
+        "ngram_range": list(vectorizer.ngram_range),
+        "stop_words": sorted(stop_words) if stop_words else None,
+        "binary": bool(vectorizer.binary),
+        "use_idf": bool(getattr(vectorizer, "use_idf", False)),
+        "sublinear_tf": bool(getattr(vectorizer, "sublinear_tf", False)),
+        "norm": getattr(vectorizer, "norm", None),
+    }
+
+def export_bundle(classifier, vectorizer, label_encoder, path: str = DEFAULT_BUNDLE_PATH,
+                  source: Optional[dict] = None) -> str:
+    """
+    Write a fitted vectorizer + linear classifier + label encoder as a single bundle file.
+
+    Args:
+        classifier: Fitted LogisticRegression or SGDClassifier(loss="log_loss").
+        vectorizer: Fitted TfidfVectorizer or CountVectorizer (word analyzer).
+        label_encoder: Fitted LabelEncoder that decodes classifier.classes_.
+        path (str): Output file; written to a temporary name and renamed into place.
+        source (dict, optional): Provenance recorded in the header (e.g. artifact paths).
+    Returns:
+        str: The bundle path.
+    """
+    settings = _vectorizer_settings(vectorizer)
+    terms = sorted(vectorizer.vocabulary_, key=vectorizer.vocabulary_.get)
+    order = np.argsort(np.array(terms, dtype=str), kind="stable")
+    # Columns are reordered to the sorted vocabulary, so a term's searchsorted position is its column.
+    arrays: Dict[str, np.ndarray] = {
+        "vocab": np.array(terms, dtype=str)[order],
+        "coef_t": np.ascontiguousarray(np.asarray(classifier.coef_, dtype=np.float64)[:, order].T),
+        "intercept": np.asarray(classifier.intercept_, dtype=np.float64).ravel(),
+        "labels": np.asarray(label_encoder.inverse_transform(classifier.classes_)).astype(str),
+    }
+    if settings["use_idf"]:
+        arrays["idf"] = np.asarray(vectorizer.idf_, dtype=np.float64)[order]
+
+    header = {
+        "format_version": FORMAT_VERSION,
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "source": source or {},
+        "vectorizer": settings,
+        "classifier": {"type": type(classifier).__name__, "proba": _proba_kind(classifier)},
+        "arrays": {},
+    }
+    # Offsets depend on the header length, which depends on the offsets; lay out relative offsets
+    # first, then shift them past a header padded to a fixed size.
+    offset = 0
+    for name, array in arrays.items():
+        header["arrays"][name] = {"dtype": array.dtype.str, "shape": list(array.shape), "offset": offset}
+        offset += -(-array.nbytes // ALIGN) * ALIGN
+    data_start = -(-(len(MAGIC) + 4 + len(json.dumps(header)) + 32 * len(arrays)) // ALIGN) * ALIGN
+    for meta in header["arrays"].values():
+        meta["offset"] += data_start
+    raw_header = json.dumps(header).encode("utf-8")
+    if len(MAGIC) + 4 + len(raw_header) > data_start:
+        raise RuntimeError("Bundle header overflowed its reserved space")
+
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(MAGIC + struct.pack("<I", len(raw_header)) + raw_header)
+        for name, array in arrays.items():
+            f.write(b"\0" * (header["arrays"][name]["offset"] - f.tell()))
+            f.write(np.ascontiguousarray(array).tobytes())
+    os.replace(tmp, path)
+    return path
+
+class ModelBundle:
+    """NumPy-only transform + predict_proba over a memory-mapped bundle file."""
+
+    def __init__(self, path: str = DEFAULT_BUNDLE_PATH):
+        self.path = path
+        with open(path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"Not a model bundle: {path}")
+            (header_len,) = struct.unpack("<I", f.read(4))
+            self.header = json.loads(f.read(header_len).decode("utf-8"))
+        if self.header["format_version"] != FORMAT_VERSION:
+            raise ValueError(f"Unsupported bundle format {self.header['format_version']} in {path}")
+        self._mmap = np.memmap(path, dtype=np.uint8, mode="r")
+        self.arrays = {
+            name: np.ndarray(tuple(meta["shape"]), dtype=np.dtype(meta["dtype"]), buffer=self._mmap,
+                             offset=meta["offset"])
+            for name, meta in self.header["arrays"].items()
+        }
+        settings = self.header["vectorizer"]
+        self._settings = settings
+        self._token_re = re.compile(settings["token_pattern"])
+        self._stop_words = frozenset(settings["stop_words"] or ())
+        self.vocab = self.arrays["vocab"]
+        self.idf = self.arrays.get("idf")
+        self.coef_t = self.arrays["coef_t"]
+        self.intercept = self.arrays["intercept"]
+        self.classes_ = self.arrays["labels"]
+
+    def analyze(self, text: str) -> List[str]:
+        """Tokens and n-grams exactly as the exported vectorizer's word analyzer produces them."""
+        settings = self._settings
+        if settings["lowercase"]:
+            text = text.lower()
+        text = _strip_accents(text, settings["strip_accents"])
+        tokens = self._token_re.findall(text)
+        if self._stop_words:
+            tokens = [t for t in tokens if t not in self._stop_words]
+        min_n, max_n = settings["ngram_range"]
+        if max_n == 1:
+            return tokens
+        grams = list(tokens) if min_n == 1 else []
+        for n in range(max(min_n, 2), max_n + 1):
+            grams.extend(" ".join(tokens[i:i + n]) for i in range(len(tokens) - n + 1))
+        return grams
+
+    def transform_one(self, text: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Return (column indices, weights) of one document's TF-IDF row."""
+        terms = self.analyze(text)
+        if not terms:
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.float64)
+        candidates = np.array(terms)
+        pos = np.searchsorted(self.vocab, candidates)
+        pos[pos == len(self.vocab)] = 0
+        pos = pos[self.vocab[pos] == candidates]
+        columns, counts = np.unique(pos, return_counts=True)
+        weights = np.ones(len(columns)) if self._settings["binary"] else counts.astype(np.float64)
+        if self._settings["sublinear_tf"]:
+            weights = np.log(weights) + 1
+        if self.idf is not None:
+            weights = weights * self.idf[columns]
+        norm = self._settings["norm"]
+        if norm == "l2":
+            total = np.sqrt(np.dot(weights, weights))
+        elif norm == "l1":
+            total = np.abs(weights).sum()
+        else:
+            total = 0.0
+        if total > 0:
+            weights = weights / total
+        return columns, weights
+
+    def decision_function(self, texts: Sequence[str]) -> np.ndarray:
+        scores = np.empty((len(texts), self.coef_t.shape[1]))
+        for row, text in enumerate(texts):
+            columns, weights = self.transform_one(text)
+            scores[row] = weights @ self.coef_t[columns] + self.intercept
+        return scores
+
+    def predict_proba(self, texts: Sequence[str]) -> np.ndarray:
+        """Class probabilities for each text, columns ordered like classes_."""
+        scores = self.decision_function(texts)
+        if scores.shape[1] == 1:
+            positive = 1 / (1 + np.exp(-scores[:, 0]))
+            return np.column_stack([1 - positive, positive])
+        if self.header["classifier"]["proba"] == "softmax":
+            scores = np.exp(scores - scores.max(axis=1, keepdims=True))
+        else:
+            scores = 1 / (1 + np.exp(-scores))
+        return scores / scores.sum(axis=1, keepdims=True)
+
+    def predict(self, texts: Sequence[str]) -> np.ndarray:
+        return self.classes_[np.argmax(self.predict_proba(texts), axis=1)]
+
+def load_bundle(path: str, mmap_mode: Optional[str] = None) -> ModelBundle:
+    """model_registry loader; bundles are always memory-mapped read-only."""
+    return ModelBundle(path)
+
+def verify(bundle: ModelBundle, classifier, vectorizer, texts: Iterable[str]) -> float:
+    """Largest absolute probability difference between the bundle and the scikit-learn models."""
+    texts = list(texts)
+    expected = classifier.predict_proba(vectorizer.transform(texts))
+    return float(np.max(np.abs(bundle.predict_proba(texts) - expected))) if texts else 0.0
+
+def main() -> None:
+    import joblib
+    parser = argparse.ArgumentParser(description="Export the role classifier as a pickle-free bundle.")
+    parser.add_argument("--model-dir", default=MODEL_DIR, help="Directory with classifier/vectorizer/label_encoder.pkl.")
+    parser.add_argument("--out", default=DEFAULT_BUNDLE_PATH)
+    parser.add_argument("--verify-data", help="CSV whose Resume column is used to check the bundle's output.")
+    parser.add_argument("--verify-samples", type=int, default=200)
+    args = parser.parse_args()
+
+    paths = {name: os.path.join(args.model_dir, f"{name}.pkl") for name in ("classifier", "vectorizer", "label_encoder")}
+    classifier, vectorizer, encoder = (joblib.load(paths[name]) for name in ("classifier", "vectorizer", "label_encoder"))
+    source = {name: {"path": os.path.abspath(path), "mtime_ns": os.stat(path).st_mtime_ns}
+              for name, path in paths.items()}
+    export_bundle(classifier, vectorizer, encoder, args.out, source=source)
+    print(f"Wrote {args.out} ({os.path.getsize(args.out) / 1024:.0f} KB)")
+    if args.verify_data:
+        import pandas as pd
+        texts = pd.read_csv(args.verify_data, usecols=["Resume"])["Resume"].dropna().astype(str)
+        diff = verify(ModelBundle(args.out), classifier, vectorizer, texts.head(args.verify_samples))
+        print(f"Max probability difference vs scikit-learn: {diff:.2e}")
+        if diff > 1e-6:
+            raise SystemExit("Bundle output does not match the scikit-learn models")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+model_registry.py
+
+Process-wide, thread-safe cache for model artifacts (joblib pickles by default, or any loader such as
+model_bundle.load_bundle). Models are loaded lazily on first use, kept in memory keyed by path, and
+reloaded automatically when the file changes on disk. Content fingerprints (sha256) of artifact files
+are memoized the same way, for indexes that must be read with the model they were built with.
+"""
+import hashlib
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import joblib
+
+class ModelRegistry:
+    """Lazily load and share joblib artifacts, keyed by absolute path and file mtime/size."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._path_locks: Dict[Tuple[str, Optional[str]], threading.Lock] = {}
+        # (path, mmap_mode) -> ((mtime_ns, size), model)
+        self._models: Dict[Tuple[str, Optional[str]], Tuple[Tuple[int, int], Any]] = {}
+        self._metrics: Dict[str, Dict[str, float]] = {}
+        # path -> ((mtime_ns, size), sha256 hex digest)
+        self._fingerprints: Dict[str, Tuple[Tuple[int, int], str]] = {}
+
+    def _path_lock(self, key: Tuple[str, Optional[str]]) -> threading.Lock:
+        with self._lock:
+            return self._path_locks.setdefault(key, threading.Lock())
+
+    def _record(self, path: str, field: str, seconds: float = 0.0) -> None:
+        with self._lock:
+            stats = self._metrics.setdefault(path, {"loads": 0, "hits": 0, "last_load_seconds": 0.0,
+                                                     "total_load_seconds": 0.0})
+            stats[field] += 1
+            if field == "loads":
+                stats["last_load_seconds"] = seconds
+                stats["total_load_seconds"] += seconds
+
+    def get(self, path: str, mmap_mode: Optional[str] = None, loader: Optional[Callable[..., Any]] = None) -> Any:
+        """
+        Return the model stored at path, loading it only if it is new or changed on disk.
+
+        Args:
+            path (str): Path to a joblib/pickle file.
+            mmap_mode (str, optional): Passed to joblib.load (e.g. 'r') to memory-map large arrays.
+            loader (callable, optional): loader(path, mmap_mode=...) used instead of joblib.load.
+        """
+        path = os.path.abspath(path)
+        if not os.path.isfile(path):
+            raise FileNotFoundError(f"Model not found: {path}")
+        key = (path, mmap_mode)
+        st = os.stat(path)
+        version = (st.st_mtime_ns, st.st_size)
+        cached = self._models.get(key)
+        if cached is not None and cached[0] == version:
+            self._record(path, "hits")
+            return cached[1]
+        with self._path_lock(key):
+            # Another thread may have loaded it while we waited for the lock.
+            cached = self._models.get(key)
+            if cached is not None and cached[0] == version:
+                self._record(path, "hits")
+                return cached[1]
+            start = time.perf_counter()
+            model = (loader or joblib.load)(path, mmap_mode=mmap_mode)
+            self._models[key] = (version, model)
+            self._record(path, "loads", time.perf_counter() - start)
+            return model
+
+    def fingerprint(self, path: str) -> str:
+        """sha256 of the file at path, recomputed only when its mtime/size change."""
+        path = os.path.abspath(path)
+        st = os.stat(path)
+        version = (st.st_mtime_ns, st.st_size)
+        cached = self._fingerprints.get(path)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        self._fingerprints[path] = (version, digest.hexdigest())
+        return digest.hexdigest()
+
+    def metrics(self) -> Dict[str, Dict[str, float]]:
+        """Return per-path load/hit counts and load timings."""
+        with self._lock:
+            return {path: dict(stats) for path, stats in self._metrics.items()}
+
+    def clear(self) -> None:
+        """Drop every cached model (the next get() reloads from disk)."""
+        with self._lock:
+            self._models.clear()
+            self._fingerprints.clear()
+
+registry = ModelRegistry()
+
+def load_model(path: str, mmap_mode: Optional[str] = None, loader: Optional[Callable[..., Any]] = None) -> Any:
+    """Load a model through the shared process-wide registry."""
+    return registry.get(path, mmap_mode=mmap_mode, loader=loader)
+
+def model_fingerprint(path: str) -> str:
+    """Content hash of a model file, through the shared registry."""
+    return registry.fingerprint(path)
@@ -0,0 +1,89 @@
+"""
+parse_cache.py
+
+Content-addressed cache for parsed resumes. Results are keyed by a SHA-256 of the file bytes plus the
+parser/model version, held in a size-capped in-memory LRU and optionally persisted to SQLite so the
+same resume is never parsed twice.
+"""
+import copy
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+def content_key(data: bytes, version: str = "") -> str:
+    """Return the cache key for raw file bytes under a given parser version."""
+    digest = hashlib.sha256()
+    digest.update(version.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(data)
+    return digest.hexdigest()
+
+class ParseCache:
+    """Two-tier (memory LRU + optional SQLite) cache of parse results."""
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, disk_dir: Optional[str] = None):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (size, result)
+        self._size = 0
+        self._stats = {"hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0}
+        self._db = None
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+            self._db = sqlite3.connect(os.path.join(disk_dir, "parse_cache.sqlite3"), check_same_thread=False)
+            self._db.execute("CREATE TABLE IF NOT EXISTS parses (key TEXT PRIMARY KEY, result TEXT NOT NULL)")
+            self._db.commit()
+
+    def _put_memory(self, key: str, result: dict, size: int) -> None:
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._size -= self._entries.pop(key)[0]
+        self._entries[key] = (size, result)
+        self._size += size
+        while self._size > self.max_bytes:
+            _, (evicted_size, _) = self._entries.popitem(last=False)
+            self._size -= evicted_size
+            self._stats["evictions"] += 1
+
+    def get(self, key: str) -> Optional[dict]:
+        """Return a copy of the cached result for key, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                return copy.deepcopy(entry[1])
+            if self._db is not None:
+                row = self._db.execute("SELECT result FROM parses WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    result = json.loads(row[0])
+                    self._put_memory(key, result, len(row[0]))
+                    self._stats["disk_hits"] += 1
+                    return copy.deepcopy(result)
+            self._stats["misses"] += 1
+            return None
+
+    def put(self, key: str, result: dict) -> None:
+        """Store a parse result in memory and, if configured, on disk."""
+        payload = json.dumps(result)
+        with self._lock:
+            self._put_memory(key, copy.deepcopy(result), len(payload))
+            if self._db is not None:
+                self._db.execute("INSERT OR REPLACE INTO parses (key, result) VALUES (?, ?)", (key, payload))
+                self._db.commit()
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss/eviction counters and the current memory footprint."""
+        with self._lock:
+            return dict(self._stats, entries=len(self._entries), bytes=self._size)
+
+    def clear(self) -> None:
+        """Empty the in-memory tier (the disk tier is left untouched)."""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
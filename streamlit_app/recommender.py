@@ -5,14 +5,71 @@ Provides ResumeRecommender for predicting top job roles based on resume text usi
 """
 import os
 import numpy as np
-import joblib
+from typing import Iterable, List, Tuple
+import config
+from instrumentation import timed
+from model_bundle import load_bundle
+from model_registry import load_model
+
+MODEL_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "model"))
+# Names the promoted version directory (relative to model/), written by train_classifier.promote.
+CURRENT_VERSION_FILE = os.path.join(MODEL_DIR, "CURRENT")
+ARTIFACTS = ("classifier.pkl", "vectorizer.pkl", "label_encoder.pkl")
+
+def promoted_version_dir(pointer_path: str = CURRENT_VERSION_FILE):
+    """Directory of the promoted classifier version, or None when nothing has been promoted."""
+    try:
+        with open(pointer_path, "r", encoding="utf-8") as f:
+            version = f.read().strip()
+    except FileNotFoundError:
+        return None
+    return os.path.join(os.path.dirname(pointer_path), version) if version else None
 
 class ResumeRecommender:
-    def __init__(self, classifier_path=None, vectorizer_path=None, label_encoder_path=None):
-        base_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "model"))
-        self.classifier = joblib.load(classifier_path or os.path.join(base_dir, 'classifier.pkl'))
-        self.vectorizer = joblib.load(vectorizer_path or os.path.join(base_dir, 'vectorizer.pkl'))
-        self.label_encoder = joblib.load(label_encoder_path or os.path.join(base_dir, 'label_encoder.pkl'))
+    def __init__(self, classifier_path=None, vectorizer_path=None, label_encoder_path=None, mmap_mode=None,
+                 bundle_path=None):
+        self.classifier_path = classifier_path or os.path.join(MODEL_DIR, 'classifier.pkl')
+        self.vectorizer_path = vectorizer_path or os.path.join(MODEL_DIR, 'vectorizer.pkl')
+        self.label_encoder_path = label_encoder_path or os.path.join(MODEL_DIR, 'label_encoder.pkl')
+        # Without explicit paths a promoted version (model/CURRENT) takes precedence over model/*.pkl.
+        self.use_promoted = not (classifier_path or vectorizer_path or label_encoder_path)
+        self.mmap_mode = mmap_mode
+        # With a bundle (model_bundle.py) the pickles are never loaded on the recommendation path.
+        self.bundle_path = bundle_path or config.MODEL_BUNDLE_PATH
+        # Load eagerly once so missing files fail fast; later accesses hit the shared registry.
+        if self.bundle_path:
+            load_model(self.bundle_path, loader=load_bundle)
+        else:
+            self.models()
+
+    def artifact_paths(self) -> Tuple[str, str, str]:
+        """Classifier, vectorizer and label encoder paths, all from one read of the version pointer."""
+        version_dir = promoted_version_dir() if self.use_promoted else None
+        if version_dir:
+            return tuple(os.path.join(version_dir, name) for name in ARTIFACTS)
+        return self.classifier_path, self.vectorizer_path, self.label_encoder_path
+
+    # Models are resolved through the registry on access, so every instance shares one copy
+    # and picks up retrained artifacts as soon as they change on disk.
+    def models(self):
+        """(classifier, vectorizer, label_encoder) belonging to the same trained version."""
+        return tuple(load_model(path, mmap_mode=self.mmap_mode) for path in self.artifact_paths())
+
+    @property
+    def classifier(self):
+        return self.models()[0]
+
+    @property
+    def vectorizer(self):
+        return self.models()[1]
+
+    @property
+    def label_encoder(self):
+        return self.models()[2]
+
+    @property
+    def bundle(self):
+        return load_model(self.bundle_path, loader=load_bundle) if self.bundle_path else None
 
     def recommend_roles(self, resume_text: str, top_n: int = 3):
         """
@@ -24,12 +81,58 @@ class ResumeRecommender:
         Returns:
             List[Tuple[str, float]]: [(role_name, probability %), ...]
         """
-        if not resume_text or not resume_text.strip():
-            return [("No content", 0.0)]
-        X_vectorized = self.vectorizer.transform([resume_text])
-        probs = self.classifier.predict_proba(X_vectorized)[0]
-        top_indices = np.argsort(probs)[::-1][:top_n]
-        return [
-            (self.label_encoder.inverse_transform([idx])[0], round(probs[idx] * 100, 2))
-            for idx in top_indices
-        ]
+        return self.recommend_roles_batch([resume_text], top_n=top_n)[0]
+
+    @timed("recommend_roles")
+    def _recommend_chunk(self, texts: List[str], top_n: int) -> List[List[Tuple[str, float]]]:
+        """Vectorize, predict and decode the top N roles for one chunk of resumes."""
+        results: List[List[Tuple[str, float]]] = [[("No content", 0.0)] for _ in texts]
+        rows = [i for i, text in enumerate(texts) if text and text.strip()]
+        if not rows:
+            return results
+        bundle = self.bundle
+        if bundle is not None:
+            probs = bundle.predict_proba([texts[i] for i in rows])
+            class_names = bundle.classes_
+        else:
+            # Resolved together so a promotion mid-request cannot mix artifacts from two versions.
+            classifier, vectorizer, label_encoder = self.models()
+            probs = classifier.predict_proba(vectorizer.transform([texts[i] for i in rows]))
+            class_names = label_encoder.classes_
+        k = max(1, min(top_n, probs.shape[1]))
+        top = np.argpartition(-probs, k - 1, axis=1)[:, :k]
+        top_probs = np.take_along_axis(probs, top, axis=1)
+        order = np.argsort(-top_probs, axis=1)
+        top = np.take_along_axis(top, order, axis=1)
+        top_probs = np.round(np.take_along_axis(top_probs, order, axis=1) * 100, 2)
+        names = class_names[top]
+        for row, row_names, row_probs in zip(rows, names, top_probs):
+            results[row] = [(str(name), float(p)) for name, p in zip(row_names, row_probs)]
+        return results
+
+    def _iter_recommend(self, texts: Iterable[str], top_n: int, chunk_size: int):
+        chunk: List[str] = []
+        for text in texts:
+            chunk.append(text)
+            if len(chunk) >= chunk_size:
+                yield from self._recommend_chunk(chunk, top_n)
+                chunk = []
+        if chunk:
+            yield from self._recommend_chunk(chunk, top_n)
+
+    def recommend_roles_batch(self, resume_texts: Iterable[str], top_n: int = 3, chunk_size: int = 1024):
+        """
+        Recommend top N job roles for many resumes with one transform/predict_proba per chunk.
+
+        Args:
+            resume_texts (Iterable[str]): Resume texts. Lists and tuples are scored eagerly; any other
+                iterable (e.g. a generator) is consumed lazily and results are streamed chunk by chunk.
+            top_n (int): Number of top roles to recommend per resume.
+            chunk_size (int): Number of resumes vectorized and scored together.
+        Returns:
+            List[List[Tuple[str, float]]] for list/tuple input, otherwise a generator of per-resume lists.
+        """
+        results = self._iter_recommend(resume_texts, top_n, chunk_size)
+        if isinstance(resume_texts, (list, tuple)):
+            return list(results)
+        return results
@@ -0,0 +1,78 @@
+"""
+reports.py
+
+Renders the downloadable resume analysis report (PDF and HTML) to in-memory bytes/strings.
+"""
+import html
+from string import Template
+from typing import List, Sequence, Tuple
+
+# Compiled once per process and reused for every HTML report.
+HTML_TEMPLATE = Template("""
+    <h2>Resume Analysis Report</h2>
+    <h3>Selected Role: $role</h3>
+    <p><b>Score:</b> $score/100</p>
+    <p><b>Matched Keywords:</b> $matched</p>
+    <p><b>Missing Keywords:</b> $missing</p>
+    <h4>Role Probabilities</h4>
+    <ul>
+    $probabilities
+    </ul>
+    <h4>Recommendations</h4>
+    <ul>
+    $recommendations
+    </ul>
+    """)
+
+def _keyword_list(keywords: Sequence[str]) -> str:
+    return html.escape(", ".join(keywords)) if keywords else "None"
+
+def render_pdf_report(selected_role: str, score: float, matched_keywords: Sequence[str],
+                      missing_keywords: Sequence[str], predicted_roles: List[Tuple[str, float]]) -> bytes:
+    """Build the PDF analysis report and return its bytes."""
+    from fpdf import FPDF
+    pdf = FPDF()
+    pdf.add_page()
+    pdf.set_font("Arial", size=14)
+    pdf.cell(0, 10, "Resume Analysis Report", ln=True, align="C")
+    pdf.ln(5)
+    pdf.set_font("Arial", size=12)
+    pdf.cell(0, 10, f"Selected Role: {selected_role}", ln=True)
+    pdf.cell(0, 10, f"Score: {score}/100", ln=True)
+    pdf.ln(3)
+    pdf.set_font("Arial", style="B", size=12)
+    pdf.cell(0, 10, "Matched Keywords:", ln=True)
+    pdf.set_font("Arial", size=12)
+    pdf.multi_cell(0, 8, ", ".join(matched_keywords) if matched_keywords else "None")
+    pdf.set_font("Arial", style="B", size=12)
+    pdf.cell(0, 10, "Missing Keywords:", ln=True)
+    pdf.set_font("Arial", size=12)
+    pdf.multi_cell(0, 8, ", ".join(missing_keywords) if missing_keywords else "None")
+    pdf.ln(2)
+    pdf.set_font("Arial", style="B", size=12)
+    pdf.cell(0, 10, "Role Probabilities:", ln=True)
+    pdf.set_font("Arial", size=12)
+    for role, confidence in predicted_roles:
+        pdf.cell(0, 8, f"{role}: {confidence}%", ln=True)
+    pdf.ln(2)
+    pdf.set_font("Arial", style="B", size=12)
+    pdf.cell(0, 10, "Top Recommendations:", ln=True)
+    pdf.set_font("Arial", size=12)
+    for role, confidence in predicted_roles[:3]:
+        pdf.cell(0, 8, f"{role} ({confidence}%)", ln=True)
+    # PyFPDF returns a latin-1 str, fpdf2 a bytearray
+    output = pdf.output(dest="S")
+    return output.encode("latin-1") if isinstance(output, str) else bytes(output)
+
+def render_html_report(selected_role: str, score: float, matched_keywords: Sequence[str],
+                       missing_keywords: Sequence[str], predicted_roles: List[Tuple[str, float]]) -> str:
+    """Build the HTML analysis report."""
+    return HTML_TEMPLATE.substitute(
+        role=html.escape(str(selected_role)),
+        score=score,
+        matched=_keyword_list(matched_keywords),
+        missing=_keyword_list(missing_keywords),
+        probabilities="".join(f"<li>{html.escape(str(role))}: {confidence}%" for role, confidence in predicted_roles),
+        recommendations="".join(f"<li>{html.escape(str(role))} ({confidence}%)"
+                                for role, confidence in predicted_roles[:3]),
+    )
@@ -0,0 +1,265 @@
+"""
+resume_index.py
+
+Persistent, memory-mapped index of resume TF-IDF vectors. Each append writes an immutable segment of
+CSR arrays (indptr/indices/data .npy) plus per-role keyword scores and a small metadata table; deletes
+are tombstones in the manifest until compact() rewrites the live rows into one segment. Segments open
+with mmap, so opening an index costs almost nothing regardless of its size. The manifest records a
+fingerprint of the vectorizer the vectors were made with; a different vectorizer is refused.
+
+Layout:
+    <index_dir>/manifest.json
+    <index_dir>/seg-000001/{indptr,indices,data,scores}.npy + meta.json
+"""
+import hashlib
+import json
+import os
+import shutil
+import threading
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+from scipy import sparse
+
+from jd_matcher import JDMatcher, get_jd_matcher
+from score_resume import ROLE_NAMES, score_all_roles_batch
+
+MANIFEST = "manifest.json"
+INDEX_VERSION = 1
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256((text or "").encode("utf-8")).hexdigest()
+
+class _Segment:
+    """One immutable, memory-mapped block of indexed resumes."""
+
+    def __init__(self, path: str, n_features: int):
+        self.name = os.path.basename(path)
+        indptr, indices, data, self.scores = (np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r")
+                                              for name in ("indptr", "indices", "data", "scores"))
+        self.vectors = sparse.csr_matrix((data, indices, indptr), shape=(len(indptr) - 1, n_features), copy=False)
+        with open(os.path.join(path, "meta.json"), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        self.ids: List[str] = meta["ids"]
+        self.hashes: List[str] = meta["hashes"]
+        self.roles: List[str] = meta["roles"]
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+def _write_segment(path: str, vectors: sparse.csr_matrix, scores: np.ndarray, ids: List[str],
+                   hashes: List[str], roles: List[str]) -> None:
+    os.makedirs(path)
+    np.save(os.path.join(path, "indptr.npy"), vectors.indptr.astype(np.int64))
+    np.save(os.path.join(path, "indices.npy"), vectors.indices.astype(np.int32))
+    np.save(os.path.join(path, "data.npy"), vectors.data.astype(np.float32))
+    np.save(os.path.join(path, "scores.npy"), np.asarray(scores, dtype=np.float32))
+    with open(os.path.join(path, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump({"ids": ids, "hashes": hashes, "roles": roles}, f)
+
+class ResumeIndex:
+    """
+    Searchable on-disk pool of resumes.
+
+    One process should write at a time; any number may open the index read-only. Ids are strings, and
+    adding an id that is already indexed replaces the old entry.
+    """
+
+    def __init__(self, path: str, matcher: Optional[JDMatcher] = None, recommender=None):
+        self.path = path
+        self.matcher = matcher or get_jd_matcher()
+        self._recommender = recommender
+        self._lock = threading.Lock()
+        manifest_path = os.path.join(path, MANIFEST)
+        if os.path.isfile(manifest_path):
+            with open(manifest_path, "r", encoding="utf-8") as f:
+                self._manifest = json.load(f)
+            if self._manifest.get("roles") != ROLE_NAMES:
+                raise ValueError("Index was built with a different role list; rebuild it")
+            if "vectorizer_sha256" not in self._manifest:
+                # Indexes from before fingerprints were recorded adopt the vectorizer they are opened with.
+                self._manifest["vectorizer_sha256"] = self.matcher.fingerprint()
+                self._save_manifest()
+            self._check_vectorizer()
+        else:
+            os.makedirs(path, exist_ok=True)
+            self._manifest = {"version": INDEX_VERSION, "n_features": self._n_features(), "roles": ROLE_NAMES,
+                              "vectorizer_sha256": self.matcher.fingerprint(),
+                              "next_segment": 1, "segments": [], "deleted": {}}
+            self._save_manifest()
+        self._segments = [_Segment(os.path.join(path, name), self._manifest["n_features"])
+                          for name in self._manifest["segments"]]
+        self._locations = {}  # id -> (segment name, row) of the live entry
+        for segment in self._segments:
+            deleted = set(self._manifest["deleted"].get(segment.name, ()))
+            for row, item_id in enumerate(segment.ids):
+                if row not in deleted:
+                    self._locations[item_id] = (segment.name, row)
+
+    def _n_features(self) -> int:
+        vectorizer = self.matcher.vectorizer
+        # A HashingVectorizer (see train_classifier.py) has a fixed width instead of a vocabulary.
+        return getattr(vectorizer, "n_features", None) or len(vectorizer.vocabulary_)
+
+    def _check_vectorizer(self) -> None:
+        """Refuse to mix vectors from different vectorizers (e.g. after vectorizer.pkl was replaced)."""
+        if self.matcher.fingerprint() != self._manifest["vectorizer_sha256"]:
+            raise ValueError(f"Index {self.path} was built with a different vectorizer; rebuild it")
+
+    def _save_manifest(self) -> None:
+        tmp = os.path.join(self.path, MANIFEST + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self._manifest, f)
+        os.replace(tmp, os.path.join(self.path, MANIFEST))
+
+    @property
+    def recommender(self):
+        if self._recommender is None:
+            from recommender import ResumeRecommender
+            self._recommender = ResumeRecommender()
+        return self._recommender
+
+    def __len__(self) -> int:
+        return len(self._locations)
+
+    def __contains__(self, item_id: str) -> bool:
+        return item_id in self._locations
+
+    def _tombstone(self, item_id: str) -> bool:
+        location = self._locations.pop(item_id, None)
+        if location is None:
+            return False
+        self._manifest["deleted"].setdefault(location[0], []).append(location[1])
+        return True
+
+    def add(self, resume_texts: Sequence[str], ids: Sequence[str]) -> int:
+        """
+        Append resumes as a new segment. Resumes whose id and content are already indexed are skipped,
+        and an id given more than once keeps its last text.
+
+        Returns:
+            int: Number of resumes written.
+        """
+        if len(resume_texts) != len(ids):
+            raise ValueError("ids and resume_texts must have the same length")
+        with self._lock:
+            self._check_vectorizer()
+            last = {str(item_id): i for i, item_id in enumerate(ids)}
+            rows = []
+            for item_id, i in last.items():
+                text = resume_texts[i]
+                location = self._locations.get(item_id)
+                if location is not None and self._segment(location[0]).hashes[location[1]] == text_hash(text):
+                    continue
+                rows.append(i)
+            if not rows:
+                return 0
+            texts = [resume_texts[i] for i in rows]
+            new_ids = [str(ids[i]) for i in rows]
+            roles = [ranked[0][0] for ranked in self.recommender.recommend_roles_batch(texts, top_n=1)]
+            name = f"seg-{self._manifest['next_segment']:06d}"
+            _write_segment(os.path.join(self.path, name), self.matcher.transform(texts), score_all_roles_batch(texts),
+                           new_ids, [text_hash(text) for text in texts], roles)
+            for item_id in new_ids:
+                self._tombstone(item_id)
+            segment = _Segment(os.path.join(self.path, name), self._manifest["n_features"])
+            self._segments.append(segment)
+            for row, item_id in enumerate(new_ids):
+                self._locations[item_id] = (name, row)
+            self._manifest["segments"].append(name)
+            self._manifest["next_segment"] += 1
+            self._save_manifest()
+            return len(rows)
+
+    def delete(self, ids: Iterable[str]) -> int:
+        """Tombstone resumes by id; space is reclaimed by compact(). Returns the number deleted."""
+        with self._lock:
+            count = sum(self._tombstone(str(item_id)) for item_id in ids)
+            if count:
+                self._save_manifest()
+            return count
+
+    def compact(self) -> None:
+        """Rewrite all live rows into a single segment and drop the old segments."""
+        with self._lock:
+            if len(self._segments) <= 1 and not any(self._manifest["deleted"].values()):
+                return
+            vectors, scores, ids, hashes, roles = [], [], [], [], []
+            for segment in self._segments:
+                live = self._live_rows(segment)
+                vectors.append(segment.vectors[live])
+                scores.append(np.asarray(segment.scores[live]))
+                ids += [segment.ids[i] for i in live]
+                hashes += [segment.hashes[i] for i in live]
+                roles += [segment.roles[i] for i in live]
+            name = f"seg-{self._manifest['next_segment']:06d}"
+            merged = sparse.vstack(vectors, format="csr") if vectors else sparse.csr_matrix((0, self._manifest["n_features"]))
+            merged_scores = np.vstack(scores) if scores else np.empty((0, len(ROLE_NAMES)))
+            _write_segment(os.path.join(self.path, name), merged, merged_scores, ids, hashes, roles)
+            old = self._manifest["segments"]
+            self._manifest.update(segments=[name], deleted={}, next_segment=self._manifest["next_segment"] + 1)
+            self._save_manifest()
+            self._segments = [_Segment(os.path.join(self.path, name), self._manifest["n_features"])]
+            self._locations = {item_id: (name, row) for row, item_id in enumerate(ids)}
+            for old_name in old:
+                shutil.rmtree(os.path.join(self.path, old_name), ignore_errors=True)
+
+    def _segment(self, name: str) -> _Segment:
+        return next(segment for segment in self._segments if segment.name == name)
+
+    def _live_rows(self, segment: _Segment) -> np.ndarray:
+        mask = np.ones(len(segment), dtype=bool)
+        deleted = self._manifest["deleted"].get(segment.name)
+        if deleted:
+            mask[deleted] = False
+        return np.flatnonzero(mask)
+
+    def search(self, jd_text: Optional[str] = None, skills: Optional[Sequence[str]] = None,
+               role: Optional[str] = None, min_score: float = 0.0, top_k: int = 10) -> List[Dict]:
+        """
+        Return the top-k indexed resumes for a job description, a skill set and/or a role.
+
+        Args:
+            jd_text (str, optional): Rank by TF-IDF cosine similarity to this job description.
+            skills (Sequence[str], optional): Rank by similarity to these skills (combined with jd_text if both).
+            role (str, optional): Keep resumes whose keyword score for this role is >= min_score; ranks by that
+                score when no text query is given.
+            min_score (float): Minimum role score (0-100) when role is set.
+            top_k (int): Number of results.
+        Returns:
+            List[dict]: [{"id", "similarity", "role_score", "predicted_role"}, ...], best first.
+        """
+        query_text = " ".join(filter(None, [jd_text, " ".join(skills or [])]))
+        if not query_text and role is None:
+            raise ValueError("Provide jd_text, skills or role")
+        role_col = None
+        if role is not None:
+            if role not in ROLE_NAMES:
+                raise ValueError(f"Unknown role: {role}")
+            role_col = ROLE_NAMES.index(role)
+        if query_text:
+            self._check_vectorizer()
+        query = self.matcher.transform([query_text]).T if query_text else None
+        candidates = []  # (rank value, segment, row, similarity)
+        for segment in self._segments:
+            rows = self._live_rows(segment)
+            if role_col is not None:
+                rows = rows[np.asarray(segment.scores[rows, role_col]) >= min_score]
+            if not len(rows):
+                continue
+            similarity = (segment.vectors[rows] @ query).toarray().ravel() if query is not None else None
+            rank = similarity if similarity is not None else np.asarray(segment.scores[rows, role_col])
+            k = min(top_k, len(rows))
+            for j in np.argpartition(-rank, k - 1)[:k]:
+                candidates.append((float(rank[j]), segment, int(rows[j]),
+                                   float(similarity[j]) if similarity is not None else None))
+        candidates.sort(key=lambda c: -c[0])
+        results = []
+        for _, segment, row, similarity in candidates[:top_k]:
+            results.append({
+                "id": segment.ids[row],
+                "similarity": round(similarity * 100, 2) if similarity is not None else None,
+                "role_score": float(segment.scores[row, role_col]) if role_col is not None else None,
+                "predicted_role": segment.roles[row],
+            })
+        return results
@@ -3,10 +3,22 @@ resume_parser.py
 
 Extracts text and key entities from resumes (PDFs, DOCX, TXT) using spaCy and regex.
 """
+import io
 import re
-import spacy
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+from importlib import metadata
+from typing import Iterable, Iterator, List, Optional, Union
 from PyPDF2 import PdfReader
 import os
+import config
+from instrumentation import count, span, timed, timed_iter
+from parse_cache import ParseCache, content_key
+from score_resume import get_skill_matcher
+from section_segmenter import get_section_segmenter
 
 try:
     import docx
@@ -14,11 +26,48 @@ except ImportError:
     docx = None
 
 try:
-    nlp = spacy.load("en_core_web_sm")
-except OSError:
-    from spacy.cli import download
-    download("en_core_web_sm")
-    nlp = spacy.load("en_core_web_sm")
+    import pypdfium2 as pdfium
+except ImportError:
+    pdfium = None
+
+SPACY_MODEL = "en_core_web_sm"
+# Only NER is used (for PERSON), so everything else in the pipeline is never loaded.
+SPACY_EXCLUDE = ["tagger", "parser", "senter", "attribute_ruler", "lemmatizer"]
+# Names sit at the top of a resume; NER only sees this many leading characters.
+NER_HEADER_CHARS = 1000
+
+_nlp = None
+_nlp_lock = threading.Lock()
+
+def get_nlp():
+    """Load the trimmed spaCy pipeline on first use (once per process)."""
+    global _nlp
+    if _nlp is None:
+        with _nlp_lock:
+            if _nlp is None:
+                import spacy
+                try:
+                    nlp = spacy.load(SPACY_MODEL, exclude=SPACY_EXCLUDE)
+                except OSError:
+                    from spacy.cli import download
+                    download(SPACY_MODEL)
+                    nlp = spacy.load(SPACY_MODEL, exclude=SPACY_EXCLUDE)
+                # The shared tok2vec only feeds the excluded tagger/parser; NER has its own.
+                if "tok2vec" in nlp.pipe_names and not getattr(nlp.get_pipe("tok2vec"), "listening_components", True):
+                    nlp.remove_pipe("tok2vec")
+                _nlp = nlp
+    return _nlp
+
+def header_region(text: str, max_chars: int = NER_HEADER_CHARS) -> str:
+    """Return the leading part of the resume, cut at a line break where possible."""
+    if len(text) <= max_chars:
+        return text
+    cut = text.rfind("\n", 0, max_chars)
+    return text[:cut if cut > 0 else max_chars]
+
+# Bump when extraction logic changes so cached parses are invalidated.
+PARSER_VERSION = "6"
+PARSE_CACHE = ParseCache(max_bytes=config.PARSE_CACHE_MAX_BYTES, disk_dir=config.PARSE_CACHE_DIR)
 
 SKILLS_DB = [
     'python', 'java', 'c++', 'sql', 'machine learning', 'deep learning',
@@ -26,13 +75,183 @@ SKILLS_DB = [
     'html', 'css', 'javascript', 'react', 'node.js', 'excel', 'power bi'
 ]
 
+# Pages handed to a worker process per task when extracting in parallel.
+PDF_PAGES_PER_TASK = 4
+
+def _pdf_backend(backend: Optional[str] = None) -> str:
+    backend = (backend or config.PDF_BACKEND).lower()
+    if backend == "auto":
+        return "pypdfium2" if pdfium else "pypdf2"
+    if backend == "pypdfium2" and not pdfium:
+        raise ImportError("pypdfium2 is not installed")
+    return backend
+
+# In-memory file contents, e.g. Streamlit's UploadedFile.getbuffer() memoryview.
+Buffer = Union[bytes, bytearray, memoryview]
+# A PDF is read either from a path or from its raw bytes (e.g. an upload held in memory).
+PdfSource = Union[str, bytes]
+
+def _as_bytes(data: Buffer) -> bytes:
+    """Return data as bytes, reusing the underlying object when a memoryview spans a whole bytes object."""
+    if isinstance(data, bytes):
+        return data
+    if isinstance(data, memoryview) and isinstance(data.obj, bytes) and data.nbytes == len(data.obj):
+        return data.obj
+    return bytes(data)
+
+def _open_pdf_stream(source: PdfSource):
+    # BytesIO shares an initial bytes object instead of copying it.
+    return io.BytesIO(source) if isinstance(source, bytes) else open(source, 'rb')
+
+def _pdf_page_count(source: PdfSource, backend: str) -> int:
+    if backend == "pypdfium2":
+        pdf = pdfium.PdfDocument(source)
+        try:
+            return len(pdf)
+        finally:
+            pdf.close()
+    with _open_pdf_stream(source) as file:
+        return len(PdfReader(file).pages)
+
+def _iter_page_texts(source: PdfSource, start: int, stop: int, backend: str) -> Iterator[str]:
+    """Yield the text of pages [start, stop) with a single open of the document."""
+    if backend == "pypdfium2":
+        pdf = pdfium.PdfDocument(source)
+        try:
+            for i in range(start, min(stop, len(pdf))):
+                page = pdf[i]
+                textpage = page.get_textpage()
+                try:
+                    yield textpage.get_text_range()
+                finally:
+                    textpage.close()
+                    page.close()
+        finally:
+            pdf.close()
+        return
+    with _open_pdf_stream(source) as file:
+        reader = PdfReader(file)
+        for i in range(start, min(stop, len(reader.pages))):
+            yield reader.pages[i].extract_text() or ""
+
+def _extract_page_range(source: PdfSource, start: int, stop: int, backend: str) -> List[str]:
+    """Worker entry point for page-parallel extraction."""
+    return list(_iter_page_texts(source, start, stop, backend))
+
+_page_pool = None
+_page_pool_lock = threading.Lock()
+
+def _get_page_pool(workers: int) -> ProcessPoolExecutor:
+    """Return the shared page-extraction pool, starting it on first use (once per process)."""
+    global _page_pool
+    with _page_pool_lock:
+        if _page_pool is None:
+            _page_pool = ProcessPoolExecutor(max_workers=workers)
+        return _page_pool
+
+def _recycle_page_pool(pool: ProcessPoolExecutor) -> None:
+    """Kill the pool's workers (a hung page would otherwise keep one busy) and start afresh next time."""
+    global _page_pool
+    with _page_pool_lock:
+        if _page_pool is pool:
+            _page_pool = None
+    kill_workers = getattr(pool, "kill_workers", None)  # Python 3.14+
+    if kill_workers is not None:
+        kill_workers()
+        return
+    processes = list((getattr(pool, "_processes", None) or {}).values())
+    pool.shutdown(wait=False, cancel_futures=True)
+    for process in processes:
+        process.terminate()
+
+def _iter_pages_parallel(source: PdfSource, page_count: int, workers: int, backend: str,
+                         deadline: float) -> Iterator[str]:
+    """Extract page ranges in worker processes and yield pages in order until the deadline."""
+    spool = None
+    if not isinstance(source, str):
+        # Workers get a path, not a pickled copy of the whole PDF per task.
+        fd, spool = tempfile.mkstemp(suffix=".pdf")
+        with os.fdopen(fd, "wb") as file:
+            file.write(source)
+    path = spool or source
+    pool = _get_page_pool(workers)
+    futures = []
+    try:
+        try:
+            futures = [pool.submit(_extract_page_range, path, start, start + PDF_PAGES_PER_TASK, backend)
+                       for start in range(0, page_count, PDF_PAGES_PER_TASK)]
+        except BrokenProcessPool:
+            _recycle_page_pool(pool)
+            yield from _iter_page_texts(path, 0, page_count, backend)
+            return
+        for index, future in enumerate(futures):
+            try:
+                pages = future.result(timeout=max(0.0, deadline - time.monotonic()))
+            except FutureTimeout:
+                _recycle_page_pool(pool)
+                return
+            except BrokenProcessPool:
+                # Another extraction recycled the shared pool; finish this PDF in-process.
+                _recycle_page_pool(pool)
+                yield from _iter_page_texts(path, index * PDF_PAGES_PER_TASK, page_count, backend)
+                return
+            yield from pages
+    finally:
+        # Drop queued ranges as soon as the consumer stops reading or a budget is hit.
+        for future in futures:
+            future.cancel()
+        if spool is not None:
+            try:
+                os.remove(spool)
+            except OSError:
+                pass
+
+def iter_pdf_pages(source: Union[str, Buffer], max_pages: Optional[int] = None, max_chars: Optional[int] = None,
+                   timeout: Optional[float] = None, workers: Optional[int] = None,
+                   backend: Optional[str] = None) -> Iterator[str]:
+    """
+    Stream a PDF's text page by page, stopping early once a page, character or time budget is spent.
+
+    Args:
+        source (str | bytes | memoryview): Path to the PDF, or its contents in memory.
+        max_pages (int): Maximum pages to read (default config.PDF_MAX_PAGES).
+        max_chars (int): Maximum characters to yield; the last page is truncated (default config.PDF_MAX_CHARS).
+        timeout (float): Wall-clock budget in seconds (default config.PDF_TIMEOUT_SECONDS).
+        workers (int): Worker processes; above 1, page ranges are extracted in parallel (default config.PDF_WORKERS).
+        backend (str): "auto", "pypdfium2" or "pypdf2" (default config.PDF_BACKEND).
+    Yields:
+        str: Text of each page, in page order.
+    """
+    max_pages = config.PDF_MAX_PAGES if max_pages is None else max_pages
+    max_chars = config.PDF_MAX_CHARS if max_chars is None else max_chars
+    timeout = config.PDF_TIMEOUT_SECONDS if timeout is None else timeout
+    workers = config.PDF_WORKERS if workers is None else workers
+    backend = _pdf_backend(backend)
+    if not isinstance(source, str):
+        source = _as_bytes(source)
+    deadline = time.monotonic() + timeout
+    if workers > 1:
+        page_count = min(_pdf_page_count(source, backend), max_pages)
+        pages = _iter_pages_parallel(source, page_count, workers, backend, deadline)
+    else:
+        pages = _iter_page_texts(source, 0, max_pages, backend)
+    remaining = max_chars
+    try:
+        for text in pages:
+            count("pdf_pages")
+            yield text[:remaining]
+            remaining -= len(text)
+            if remaining <= 0 or time.monotonic() >= deadline:
+                return
+    finally:
+        pages.close()
+
+@timed("extract_text")
 def extract_text_from_file(file_path: str) -> str:
     ext = os.path.splitext(file_path)[1].lower()
     if ext == ".pdf":
         try:
-            with open(file_path, 'rb') as file:
-                reader = PdfReader(file)
-                return "".join(page.extract_text() or "" for page in reader.pages)
+            return "".join(iter_pdf_pages(file_path))
         except Exception as e:
             return f"ERROR: {e}"
     elif ext == ".docx" and docx:
@@ -50,38 +269,99 @@ def extract_text_from_file(file_path: str) -> str:
     else:
         return "ERROR: Unsupported file format. Please upload PDF, DOCX, or TXT."
 
-def extract_sections(text: str) -> dict:
-    """Extracts major sections (education, experience, projects, achievements) from resume text using line-by-line parsing."""
-    import re
-    section_headers = {
-        'education': [r'education', r'academic background', r'qualifications'],
-        'experience': [r'experience', r'work experience', r'professional experience', r'employment'],
-        'projects': [r'projects?', r'project experience', r'personal projects'],
-        'achievements': [r'achievements', r'accomplishments', r'awards', r'honors']
-    }
-    lines = text.splitlines()
-    current_section = None
-    sections = {k: [] for k in section_headers}
-    for line in lines:
-        line_clean = line.strip().lower().replace(':', '').replace('-', '').replace('•', '').replace('>', '')
-        for key, headers in section_headers.items():
-            if any(re.fullmatch(h, line_clean) or h in line_clean for h in headers):
-                current_section = key
-                break
-        else:
-            if current_section and line.strip():
-                sections[current_section].append(line.strip())
-    # Join lines for each section
-    return {k: '\n'.join(v).strip() for k, v in sections.items()}
-
-def extract_entities(text: str) -> dict:
-    """Extracts name, email, phone, skills, and major sections from resume text."""
-    doc = nlp(text)
+@timed("extract_text")
+def extract_text_from_bytes(data: Buffer, filename: str) -> str:
+    """Like extract_text_from_file, but for file contents already in memory (the name picks the format)."""
+    ext = os.path.splitext(filename)[1].lower()
+    data = _as_bytes(data)
+    try:
+        if ext == ".pdf":
+            return "".join(iter_pdf_pages(data))
+        elif ext == ".docx" and docx:
+            return "\n".join([para.text for para in docx.Document(io.BytesIO(data)).paragraphs])
+        elif ext == ".txt":
+            # Same newline translation as reading the file in text mode
+            return io.TextIOWrapper(io.BytesIO(data), encoding='utf-8').read()
+    except Exception as e:
+        return f"ERROR: {e}"
+    return "ERROR: Unsupported file format. Please upload PDF, DOCX, or TXT."
+
+def iter_lines(chunks: Iterable[str]) -> Iterator[str]:
+    """Split a stream of text chunks (e.g. PDF pages) into lines, joining lines split across chunks."""
+    pending = ""
+    for chunk in chunks:
+        lines = (pending + chunk).splitlines(keepends=True)
+        pending = lines.pop() if lines and not lines[-1].endswith(("\n", "\r")) else ""
+        for line in lines:
+            yield line.rstrip("\r\n")
+    if pending:
+        yield pending
+
+@timed("extract_sections")
+def extract_sections(text: Union[str, Iterable[str]]) -> dict:
+    """Extracts major sections (education, experience, projects, achievements, ...) from resume text.
+
+    Accepts either the full text or a stream of text chunks (such as iter_pdf_pages output).
+    """
+    segmenter = get_section_segmenter()
+    sections = {k: [] for k in segmenter.headers}
+    if isinstance(text, str):
+        for section in segmenter.segment(text):
+            sections[section.name].append(text[section.start:section.end])
+    else:
+        current_section = None
+        for line in iter_lines(text):
+            found = segmenter.segment(line)
+            if found:
+                # Text before a header glued onto the line still belongs to the current section.
+                if current_section and found[0].header_start:
+                    sections[current_section].append(line[:found[0].header_start])
+                for section in found:
+                    current_section = section.name
+                    if section.end > section.start:
+                        sections[current_section].append(line[section.start:section.end])
+            elif current_section:
+                sections[current_section].append(line)
+    # Keep non-blank, stripped lines of each section
+    return {k: '\n'.join(line.strip() for body in v for line in body.splitlines() if line.strip())
+            for k, v in sections.items()}
+
+@timed("ner")
+def _ner(text: str):
+    return get_nlp()(header_region(text))
+
+@timed("extract_entities")
+def extract_entities(text: Union[str, Iterable[str]]) -> dict:
+    """Extracts name, email, phone, skills, and major sections from resume text or a stream of text chunks."""
+    if isinstance(text, str):
+        return _build_entities(text, _ner(text))
+    # Sections are split while the stream is consumed; the rest needs the whole text.
+    parts: List[str] = []
+
+    def collect(chunks: Iterable[str]) -> Iterator[str]:
+        for chunk in chunks:
+            parts.append(chunk)
+            yield chunk
+
+    sections = extract_sections(collect(text))
+    full_text = "".join(parts)
+    return _build_entities(full_text, _ner(full_text), sections)
+
+def extract_entities_batch(texts: list, batch_size: int = 32) -> list:
+    """Like extract_entities, but runs NER over all headers with nlp.pipe in batches."""
+    with span("ner"):
+        docs = list(get_nlp().pipe((header_region(text) for text in texts), batch_size=batch_size))
+    return [_build_entities(text, doc) for text, doc in zip(texts, docs)]
+
+def _build_entities(text: str, doc, sections: Optional[dict] = None) -> dict:
+    """Assemble the entity dict from the raw text and its (header) spaCy doc."""
+    count("document_chars", len(text))
     name = next((ent.text for ent in doc.ents if ent.label_ == "PERSON"), "")
     email_match = re.findall(r'[\w\.-]+@[\w\.-]+\.\w{2,4}', text)
     phone_match = re.findall(r'((?:\+\d{1,3}[\s-]?)?(?:\(?\d{3}\)?[\s-]?)?\d{3}[\s-]?\d{4})', text)
-    skills_found = [skill for skill in SKILLS_DB if skill.lower() in text.lower()]
-    sections = extract_sections(text)
+    skills_found, _ = get_skill_matcher().match(text, SKILLS_DB)
+    if sections is None:
+        sections = extract_sections(text)
     return {
         "name": name,
         "email": email_match[0] if email_match else "",
@@ -98,11 +378,46 @@ def extract_entities(text: str) -> dict:
         "text": text
     }
 
-def parse_resume(resume_path: str) -> dict:
-    """Parse a resume file and extract structured information."""
-    text = extract_text_from_file(resume_path)
-    if text.startswith("ERROR"):
-        return {"error": text}
-    return extract_entities(text)
+def parser_version() -> str:
+    """Version string for cache keys: parser logic plus the spaCy model in use."""
+    try:
+        model_version = metadata.version(SPACY_MODEL)
+    except metadata.PackageNotFoundError:
+        model_version = "unknown"
+    return f"{PARSER_VERSION}:{SPACY_MODEL}-{model_version}"
+
+def parse_resume(resume_path: str, use_cache: bool = True) -> dict:
+    """Parse a resume file and extract structured information (cached by file content)."""
+    try:
+        with open(resume_path, 'rb') as f:
+            data = f.read()
+    except OSError as e:
+        return {"error": f"ERROR: {e}"}
+    return parse_resume_bytes(data, resume_path, use_cache=use_cache)
+
+def parse_resume_bytes(data: Buffer, filename: str, use_cache: bool = True) -> dict:
+    """Parse resume file contents held in memory; filename only selects the extractor."""
+    key = None
+    if use_cache:
+        # The extension decides which extractor runs, so it is part of the version.
+        key = content_key(data, f"{parser_version()}:{os.path.splitext(filename)[1].lower()}")
+        cached = PARSE_CACHE.get(key)
+        if cached is not None:
+            return cached
+    if filename.lower().endswith(".pdf"):
+        # Sections are parsed as pages arrive instead of after the whole PDF is joined; page
+        # extraction is still reported as its own stage.
+        try:
+            result = extract_entities(timed_iter("extract_text", iter_pdf_pages(data)))
+        except Exception as e:
+            return {"error": f"ERROR: {e}"}
+    else:
+        text = extract_text_from_bytes(data, filename)
+        if text.startswith("ERROR"):
+            return {"error": text}
+        result = extract_entities(text)
+    if key is not None:
+        PARSE_CACHE.put(key, result)
+    return result
 
-__all__ = ["parse_resume"]
+__all__ = ["parse_resume", "parse_resume_bytes"]
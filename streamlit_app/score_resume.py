@@ -1,10 +1,16 @@
 """
 score_resume.py
 
-Provides skill keyword dictionaries and a function to score resumes based on keyword matches for a given job role/domain. Now supports synonyms and partial matching.
+Provides skill keyword dictionaries and a function to score resumes based on keyword matches for a given job role/domain. Now supports synonyms and word-boundary matching through a compiled skill matcher.
 """
-import re
-from typing import Dict, List
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+import numpy as np
+from scipy import sparse
+
+from instrumentation import count, timed
+from skill_matcher import SkillMatcher, load_skills_list, normalize_skill
 
 # Domain-specific skill keywords for resume scoring
 SKILL_KEYWORDS = {
@@ -94,31 +100,97 @@ SKILL_SYNONYMS: Dict[str, List[str]] = {
     # we can add more as needed
 }
 
+ROLE_NAMES: List[str] = list(SKILL_KEYWORDS)
+ROLE_SKILLS: List[str] = sorted({normalize_skill(s) for skills in SKILL_KEYWORDS.values() for s in skills})
+_ROLE_SKILL_INDEX: Dict[str, int] = {skill: i for i, skill in enumerate(ROLE_SKILLS)}
+
+def _build_role_matrix() -> sparse.csr_matrix:
+    """Build the roles x skills incidence matrix, weighted so a row product gives the 0-100 score."""
+    rows, cols, weights = [], [], []
+    for r, skills in enumerate(SKILL_KEYWORDS.values()):
+        for skill in skills:
+            rows.append(r)
+            cols.append(_ROLE_SKILL_INDEX[normalize_skill(skill)])
+            weights.append(100.0 / len(skills))
+    return sparse.csr_matrix((weights, (rows, cols)), shape=(len(ROLE_NAMES), len(ROLE_SKILLS)))
+
+ROLE_SKILL_MATRIX = _build_role_matrix()
+
+_SKILL_MATCHER: Optional[SkillMatcher] = None
+
+def get_skill_matcher() -> SkillMatcher:
+    """Return the shared matcher built from every role, synonym and skill dictionary (compiled once)."""
+    global _SKILL_MATCHER
+    if _SKILL_MATCHER is None:
+        from resume_parser import SKILLS_DB
+        vocabulary = [skill for skills in SKILL_KEYWORDS.values() for skill in skills]
+        vocabulary += list(SKILL_SYNONYMS) + SKILLS_DB + load_skills_list()
+        _SKILL_MATCHER = SkillMatcher(vocabulary, SKILL_SYNONYMS)
+    return _SKILL_MATCHER
+
+@lru_cache(maxsize=32)
+def _custom_matcher(skills: FrozenSet[str]) -> SkillMatcher:
+    """Compile a matcher for skills outside the shared vocabulary (e.g. uploaded skill lists)."""
+    return SkillMatcher(skills, SKILL_SYNONYMS)
+
+def match_skills(resume_text: str, skills: List[str]) -> Tuple[List[str], List[str]]:
+    """Return (matched, missing) for a skill list in one pass over the resume text."""
+    matcher = get_skill_matcher()
+    unknown = frozenset(normalize_skill(s) for s in skills) - matcher.skills
+    if unknown:
+        matcher = _custom_matcher(frozenset(normalize_skill(s) for s in skills))
+    return matcher.match(resume_text, skills)
+
+def match_roles(resume_text: str) -> Dict[str, Tuple[List[str], List[str]]]:
+    """Return (matched, missing) keywords for every role in SKILL_KEYWORDS from a single scan."""
+    matcher = get_skill_matcher()
+    found = matcher.find(resume_text or "")
+    return {role: matcher.match(resume_text, skills, found=found) for role, skills in SKILL_KEYWORDS.items()}
+
 def _skill_in_text(skill: str, text: str) -> bool:
-    """Return True if the skill or any synonym appears as a substring in the text."""
-    skill = skill.lower()
-    text = text.lower()
-    if skill in text:
-        return True
-    for synonym in SKILL_SYNONYMS.get(skill, []):
-        if synonym in text:
-            return True
-    return False
+    """Return True if the skill or any synonym appears as a whole word/phrase in the text."""
+    return bool(match_skills(text, [skill])[0])
 
+@timed("calculate_score")
 def calculate_score(resume_text: str, job_role: str) -> float:
     """
     Calculate the skill match score between resume content and required job role skills.
-    Supports synonyms and partial (substring) matching.
+    Supports synonyms; skills are matched on word boundaries in a single pass.
     """
     if not resume_text or not job_role:
         return 0.0
     skills = SKILL_KEYWORDS.get(job_role.strip())
     if not skills:
         return 0.0
-    resume_text = resume_text.lower().strip()
-    matched_keywords = sum(
-        1 for skill in skills if _skill_in_text(skill, resume_text)
-    )
+    matched_keywords, _ = get_skill_matcher().match(resume_text, skills)
+    count("keyword_matches", len(matched_keywords))
     total_keywords = len(skills)
-    score = (matched_keywords / total_keywords) * 100 if total_keywords else 0.0
-    return round(score, 2)
\ No newline at end of file
+    score = (len(matched_keywords) / total_keywords) * 100 if total_keywords else 0.0
+    return round(score, 2)
+
+def _presence_matrix(resume_texts: Iterable[str]) -> sparse.csr_matrix:
+    """Return the resumes x ROLE_SKILLS binary presence matrix (one matcher pass per resume)."""
+    matcher = get_skill_matcher()
+    indptr, indices = [0], []
+    for text in resume_texts:
+        indices.extend(_ROLE_SKILL_INDEX[s] for s in matcher.find(text or "") if s in _ROLE_SKILL_INDEX)
+        indptr.append(len(indices))
+    data = np.ones(len(indices), dtype=np.float64)
+    return sparse.csr_matrix((data, indices, indptr), shape=(len(indptr) - 1, len(ROLE_SKILLS)))
+
+def score_all_roles_batch(resume_texts: Iterable[str]) -> np.ndarray:
+    """
+    Score many resumes against every role with one sparse matrix product.
+
+    Args:
+        resume_texts (Iterable[str]): Raw resume texts.
+    Returns:
+        np.ndarray: N x len(ROLE_NAMES) array of scores (0-100), columns ordered as ROLE_NAMES.
+    """
+    presence = _presence_matrix(resume_texts)
+    return np.round(np.asarray((presence @ ROLE_SKILL_MATRIX.T).todense()), 2)
+
+def score_all_roles(resume_text: str) -> Dict[str, float]:
+    """Return {role: score} for every role in SKILL_KEYWORDS from a single scan of the resume."""
+    scores = score_all_roles_batch([resume_text])[0]
+    return {role: float(score) for role, score in zip(ROLE_NAMES, scores)}
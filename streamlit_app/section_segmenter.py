@@ -0,0 +1,128 @@
+"""
+section_segmenter.py
+
+Compiled resume section segmenter. Every known section header is folded into one anchored,
+multiline regex with a named group per section, so a resume is scanned once and each section is
+reported as character offsets into the original text rather than as copied lines. A header line may
+carry its first content after a colon ("Skills: Python, SQL"); that section's body then starts right
+after the colon. The dataset export's own headers ("Education Details", "Skill Details", "Company
+Details") are also recognised when they are glued to the end of the previous line's text.
+"""
+import re
+from typing import Dict, Iterator, List, NamedTuple, Optional
+
+# section -> header phrases (regex fragments, matched case-insensitively at the start of a line)
+SECTION_HEADERS: Dict[str, List[str]] = {
+    'summary': [r'summary', r'professional summary', r'career objective', r'objective', r'profile', r'about me'],
+    'education': [r'education', r'academic background', r'qualifications', r'educational qualifications'],
+    'experience': [r'experience', r'work experience', r'professional experience', r'employment',
+                   r'employment history', r'work history', r'internships?'],
+    'projects': [r'projects?', r'project experience', r'personal projects', r'academic projects'],
+    'skills': [r'skills', r'technical skills', r'key skills', r'core competencies', r'skill set'],
+    'certifications': [r'certifications?', r'certificates', r'licenses'],
+    'achievements': [r'achievements', r'accomplishments', r'awards', r'honors'],
+}
+
+# Title-case headers of the resume dataset export, often glued onto the previous line
+# ("...Deep learning.Education Details"); matched case-sensitively anywhere before a line end.
+EXPORT_HEADERS: Dict[str, List[str]] = {
+    'education': ['Education Details'],
+    'experience': ['Company Details'],
+    'skills': ['Skill Details'],
+}
+
+# Words a header may carry after its phrase ("EDUCATION DETAILS", "Work Experience & Internships:").
+MAX_TAIL_WORDS = 3
+# A title-case line may end in one of these after its phrase ("Employment History") without a colon.
+HEADER_TAIL_WORDS = frozenset({"details", "detail", "history", "information", "summary", "profile", "background"})
+# Decorations before a header; the bullet group is checked separately since list items are rarely headers.
+_LEAD = r"[ \t]*(?:[#|][ \t]*)*(?P<_bullet>(?:[•>*\-–][ \t]*)*)(?:[#|][ \t]*)*"
+
+class Section(NamedTuple):
+    name: str
+    header_start: int  # offset of the header (the line start, or where a glued export header begins)
+    start: int         # offset of the first body character (after the header line, or after its colon)
+    end: int           # offset where the next header (or the text) begins
+
+class SectionSegmenter:
+    """Split resume text into sections with a single regex pass over the text."""
+
+    def __init__(self, headers: Optional[Dict[str, List[str]]] = None,
+                 export_headers: Optional[Dict[str, List[str]]] = None):
+        self.headers = dict(headers or SECTION_HEADERS)
+        self.export_headers = {name: phrases for name, phrases in (export_headers or EXPORT_HEADERS).items()
+                               if name in self.headers}
+        groups = []
+        for name, phrases in self.headers.items():
+            # Longest phrases first so 'work experience' wins over a shorter prefix.
+            alternatives = sorted(phrases, key=len, reverse=True)
+            groups.append(f"(?P<{name}>{'|'.join(alternatives)})")
+        # Export headers are tried first and need not start the line, so "...learning.Education Details"
+        # opens education where the glued header begins; a header line's inline content stops before one.
+        phrases = [re.escape(p) for name in self.export_headers for p in self.export_headers[name]]
+        line_end = rf"(?=(?-i:{'|'.join(phrases)})[ \t]*\r?$|\r?$)" if phrases else r"\r?$"
+        body = (_LEAD + r"(?:" + "|".join(groups) + r")\b"
+                + r"(?P<_tail>[^\n:]{0,40}?)[ \t]*(?:(?P<_colon>:)[ \t]*(?P<_inline>[^\n]*?))?[ \t]*" + line_end)
+        exports = "|".join(f"(?P<_x_{name}>{'|'.join(re.escape(p) for p in phrases)})"
+                           for name, phrases in self.export_headers.items())
+        export = rf"(?-i:{exports})[ \t]*\r?$|" if exports else ""
+        self._pattern = re.compile(export + r"^" + body, re.IGNORECASE | re.MULTILINE)
+
+    def _accept(self, match: re.Match) -> Optional[str]:
+        """Return the section name if a candidate line looks like a header rather than body text."""
+        for name in self.export_headers:
+            if match.group(f"_x_{name}") is not None:
+                return name
+        tail = match.group("_tail").strip(" \t-–&/,")
+        if match.group("_bullet").strip() and (tail or match.group("_inline")):
+            # "- Project Name Nestle", "• Skills: Python" are list items; only a bare bulleted phrase is a header.
+            return None
+        if tail:
+            # Extra words ("Project Manager", "Skills Used") only make a header when it ends in ':', is ALL CAPS,
+            # or is a title-case line ending in a header word ("Employment History").
+            words = tail.split()
+            if len(words) > MAX_TAIL_WORDS:
+                return None
+            head = match.string[match.start():match.start("_colon")] if match.group("_colon") else match.group(0)
+            head = head.strip()
+            if not (match.group("_colon") or head.isupper()
+                    or (head.istitle() and words[-1].lower() in HEADER_TAIL_WORDS)):
+                return None
+        return next(name for name in self.headers if match.group(name) is not None)
+
+    def header(self, line: str) -> Optional[str]:
+        """Return the section a single line opens (the last one, if it holds several), or None for body lines."""
+        sections = self.segment(line)
+        return sections[-1].name if sections else None
+
+    def segment(self, text: str) -> List[Section]:
+        """Return the sections of text in order, as offsets; text before the first header is skipped."""
+        heads = []
+        for match in self._pattern.finditer(text):
+            name = self._accept(match)
+            if name:
+                if match.group("_inline"):
+                    start = match.start("_inline")
+                else:
+                    line_end = text.find("\n", match.end())
+                    start = len(text) if line_end < 0 else line_end + 1
+                heads.append((name, match.start(), start))
+        ends = [head[1] for head in heads[1:]] + [len(text)]
+        # A header whose line ends in a glued export header has an empty body.
+        return [Section(name, header_start, min(start, end), end)
+                for (name, header_start, start), end in zip(heads, ends)]
+
+    def iter_section_text(self, text: str, name: str) -> Iterator[str]:
+        """Yield the body of every occurrence of a section (e.g. to run NER on 'summary' only)."""
+        for section in self.segment(text):
+            if section.name == name:
+                yield text[section.start:section.end]
+
+_SEGMENTER: Optional[SectionSegmenter] = None
+
+def get_section_segmenter() -> SectionSegmenter:
+    """Return the shared segmenter for SECTION_HEADERS (compiled once)."""
+    global _SEGMENTER
+    if _SEGMENTER is None:
+        _SEGMENTER = SectionSegmenter()
+    return _SEGMENTER
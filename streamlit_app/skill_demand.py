@@ -0,0 +1,214 @@
+"""
+skill_demand.py
+
+Corpus skill-demand statistics for ranking missing keywords. One sparse document x skill presence
+matrix (from the shared SkillMatcher) is reduced by Category into count tables:
+- per-category skill counts and document counts
+- a skill x skill co-occurrence matrix
+
+These counts are all that is stored, so new labelled resumes are added incrementally by summing
+their counts in. Prevalence (share of a role's resumes that mention a skill) and lift (that share
+relative to every other role) are derived per role on first use. Request-time lookups are then dict
+and array indexing.
+
+Usage:
+    python streamlit_app/skill_demand.py --data data/UpdatedResumeDataSet.csv       # build model/skill_demand.npz
+    python streamlit_app/skill_demand.py --data new_labelled.csv --update            # add new resumes
+
+Without a saved table, the first lookup builds one from the shipped dataset.
+"""
+import argparse
+import os
+import tempfile
+import threading
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from scipy import sparse
+
+from model_registry import load_model
+from skill_matcher import SkillMatcher, normalize_skill
+
+DEFAULT_DEMAND_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "model", "skill_demand.npz"))
+DEFAULT_DATA_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "data", "UpdatedResumeDataSet.csv"))
+
+# App roles (score_resume.SKILL_KEYWORDS) -> dataset categories they draw demand from. Every role is
+# listed; an empty list means the dataset has no matching category and the role ranks by corpus-wide
+# prevalence.
+ROLE_CATEGORIES: Dict[str, List[str]] = {
+    'Data Science': ['Data Science'],
+    'Java Developer': ['Java Developer'],
+    'Web Development': ['Web Designing'],
+    'Android Development': [],  # no mobile category in the dataset
+    'DevOps': ['DevOps Engineer'],
+    'Testing': ['Testing', 'Automation Testing'],
+    'Cloud Computing': ['DevOps Engineer'],  # closest category; most of its resumes mention AWS or Azure
+    'Cyber Security': ['Network Security Engineer'],
+    'Networking': ['Network Security Engineer'],
+    'UI/UX': ['Web Designing'],
+    'Business Analyst': ['Business Analyst'],
+    'Software Development Engineer (SDE)': ['Java Developer', 'Python Developer', 'DotNet Developer'],
+    'Full Stack Developer': ['Web Designing', 'Java Developer', 'Python Developer'],
+}
+
+class SkillDemand:
+    """Incrementally updatable per-category skill counts with derived prevalence and lift."""
+
+    def __init__(self, skills: Sequence[str], categories: Sequence[str] = (),
+                 category_docs: Optional[np.ndarray] = None, category_skills: Optional[np.ndarray] = None,
+                 cooccurrence: Optional[sparse.csr_matrix] = None):
+        self.skills = [normalize_skill(s) for s in skills]
+        self.skill_index = {skill: i for i, skill in enumerate(self.skills)}
+        self.categories = list(categories)
+        self.category_index = {c: i for i, c in enumerate(self.categories)}
+        n_skills = len(self.skills)
+        self.category_docs = np.zeros(len(self.categories), dtype=np.int64) if category_docs is None else category_docs
+        self.category_skills = (np.zeros((len(self.categories), n_skills), dtype=np.int64)
+                                if category_skills is None else category_skills)
+        self.cooccurrence = (sparse.csr_matrix((n_skills, n_skills), dtype=np.int64)
+                             if cooccurrence is None else cooccurrence)
+        self._lock = threading.Lock()
+        self._roles: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_DEMAND_PATH, mmap_mode: Optional[str] = None) -> "SkillDemand":
+        """Load a saved table (also the model_registry loader; the .npz holds no pickles)."""
+        with np.load(path, allow_pickle=False) as data:
+            cooccurrence = sparse.csr_matrix((data["cooc_data"], data["cooc_indices"], data["cooc_indptr"]),
+                                             shape=(len(data["skills"]),) * 2)
+            return cls(data["skills"].tolist(), data["categories"].tolist(), data["category_docs"].copy(),
+                       data["category_skills"].copy(), cooccurrence)
+
+    def save(self, path: str = DEFAULT_DEMAND_PATH) -> None:
+        fd, tmp = tempfile.mkstemp(suffix=".npz", dir=os.path.dirname(os.path.abspath(path)))
+        os.close(fd)
+        cooc = self.cooccurrence.tocsr()
+        np.savez(tmp, skills=np.array(self.skills, dtype=str), categories=np.array(self.categories, dtype=str),
+                 category_docs=self.category_docs, category_skills=self.category_skills,
+                 cooc_data=cooc.data, cooc_indices=cooc.indices, cooc_indptr=cooc.indptr)
+        os.replace(tmp, path)
+
+    def presence(self, texts: Iterable[str], matcher: SkillMatcher) -> sparse.csr_matrix:
+        """Binary documents x skills matrix, one matcher pass per text."""
+        indptr, indices = [0], []
+        for text in texts:
+            indices.extend(sorted(self.skill_index[s] for s in matcher.find(text or "") if s in self.skill_index))
+            indptr.append(len(indices))
+        data = np.ones(len(indices), dtype=np.int64)
+        return sparse.csr_matrix((data, indices, indptr), shape=(len(indptr) - 1, len(self.skills)))
+
+    def update(self, texts: Sequence[str], categories: Sequence[str], matcher: Optional[SkillMatcher] = None) -> None:
+        """Add labelled resumes to the counts (new categories get new rows)."""
+        if len(texts) != len(categories):
+            raise ValueError("texts and categories must have the same length")
+        if matcher is None:
+            from score_resume import get_skill_matcher
+            matcher = get_skill_matcher()
+        presence = self.presence(texts, matcher)
+        with self._lock:
+            for category in categories:
+                if category not in self.category_index:
+                    self.category_index[category] = len(self.categories)
+                    self.categories.append(category)
+            grow = len(self.categories) - len(self.category_docs)
+            if grow:
+                self.category_docs = np.concatenate([self.category_docs, np.zeros(grow, dtype=np.int64)])
+                self.category_skills = np.vstack([self.category_skills,
+                                                  np.zeros((grow, len(self.skills)), dtype=np.int64)])
+            rows = np.array([self.category_index[c] for c in categories], dtype=np.int64)
+            grouping = sparse.csr_matrix((np.ones(len(rows), dtype=np.int64), (rows, np.arange(len(rows)))),
+                                         shape=(len(self.categories), len(rows)))
+            self.category_docs += np.bincount(rows, minlength=len(self.categories))
+            self.category_skills += (grouping @ presence).toarray()
+            self.cooccurrence = (self.cooccurrence + presence.T @ presence).tocsr()
+            self._roles.clear()
+
+    def _role_stats(self, role: str) -> Tuple[np.ndarray, np.ndarray]:
+        """(prevalence, lift) arrays over skills for a role or dataset category, computed once."""
+        cached = self._roles.get(role)
+        if cached is not None:
+            return cached
+        with self._lock:
+            names = ROLE_CATEGORIES.get(role, [role])
+            rows = [self.category_index[c] for c in names if c in self.category_index]
+            total_docs = self.category_docs.sum()
+            total_counts = self.category_skills.sum(axis=0)
+            if rows:
+                docs = self.category_docs[rows].sum()
+                counts = self.category_skills[rows].sum(axis=0)
+            else:
+                docs, counts = total_docs, total_counts
+            prevalence = counts / max(docs, 1)
+            # Laplace-smoothed share in this role vs. the rest of the corpus
+            other = (total_counts - counts + 1) / (total_docs - docs + 2)
+            lift = ((counts + 1) / (docs + 2)) / other if rows else np.ones(len(self.skills))
+            self._roles[role] = (prevalence, lift)
+            return prevalence, lift
+
+    def demand(self, role: str, skill: str) -> Tuple[float, float]:
+        """(prevalence 0-1, lift) of one skill for a role; (0, 0) for skills outside the table."""
+        i = self.skill_index.get(normalize_skill(skill))
+        if i is None:
+            return 0.0, 0.0
+        prevalence, lift = self._role_stats(role)
+        return float(prevalence[i]), float(lift[i])
+
+    def rank_missing(self, role: str, skills: Sequence[str]) -> List[str]:
+        """Order skills by how many of the role's resumes mention them, then by lift (stable for ties)."""
+        demand = {skill: self.demand(role, skill) for skill in skills}
+        return sorted(skills, key=lambda s: demand[s], reverse=True)
+
+    def related(self, skill: str, top_k: int = 10) -> List[Tuple[str, int]]:
+        """Skills most often mentioned together with skill: [(skill, resumes mentioning both), ...]."""
+        i = self.skill_index.get(normalize_skill(skill))
+        if i is None:
+            return []
+        row = self.cooccurrence.getrow(i)
+        pairs = [(self.skills[j], int(n)) for j, n in zip(row.indices, row.data) if j != i]
+        return sorted(pairs, key=lambda pair: pair[1], reverse=True)[:top_k]
+
+_build_lock = threading.Lock()
+
+def get_skill_demand(path: str = DEFAULT_DEMAND_PATH, data_path: str = DEFAULT_DATA_PATH) -> Optional[SkillDemand]:
+    """Return the shared demand table, building it from data_path on first use; None without either file."""
+    if not os.path.isfile(path):
+        with _build_lock:
+            if not os.path.isfile(path):
+                if not os.path.isfile(data_path):
+                    return None
+                build(data_path, path)
+    return load_model(path, loader=SkillDemand.load)
+
+def rank_missing(role: Optional[str], skills: List[str]) -> List[str]:
+    """Missing keywords ranked by role demand; unchanged when no role or no table is available."""
+    table = get_skill_demand() if role else None
+    return table.rank_missing(role, skills) if table is not None else skills
+
+def build(data_path: str, out: str = DEFAULT_DEMAND_PATH, update: bool = False, chunk_size: int = 5000,
+          text_column: str = "Resume", label_column: str = "Category") -> SkillDemand:
+    """Stream a labelled CSV into a new (or, with update, the existing) demand table and save it."""
+    from data_loader import iter_data_file
+    from score_resume import get_skill_matcher
+    matcher = get_skill_matcher()
+    table = SkillDemand.load(out) if update and os.path.isfile(out) else SkillDemand(sorted(matcher.skills))
+    for chunk in iter_data_file(data_path, [text_column, label_column], chunk_size):
+        chunk = chunk.dropna()
+        table.update(chunk[text_column].astype(str).tolist(), chunk[label_column].astype(str).tolist(), matcher)
+    table.save(out)
+    return table
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Build or update the corpus skill-demand table.")
+    parser.add_argument("--data", required=True, help="CSV with resume text and category columns.")
+    parser.add_argument("--out", default=DEFAULT_DEMAND_PATH)
+    parser.add_argument("--update", action="store_true", help="Add to the existing table instead of rebuilding.")
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    parser.add_argument("--text-column", default="Resume")
+    parser.add_argument("--label-column", default="Category")
+    args = parser.parse_args()
+    table = build(args.data, args.out, args.update, args.chunk_size, args.text_column, args.label_column)
+    print(f"{int(table.category_docs.sum())} resumes, {len(table.categories)} categories, "
+          f"{len(table.skills)} skills -> {args.out}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+skill_matcher.py
+
+Compiled multi-pattern skill matcher. All skills and synonyms are folded into a single
+trie-shaped regex with word boundaries, so a resume is lowercased and scanned once no matter
+how many skills or roles are checked against it.
+"""
+import os
+import re
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+SKILLS_LIST_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "data", "skills_list.txt"))
+_WORD_CHAR = re.compile(r"\w")
+
+def normalize_skill(skill: str) -> str:
+    """Lowercase a skill and collapse internal whitespace."""
+    return " ".join(str(skill).lower().split())
+
+def load_skills_list(path: str = SKILLS_LIST_PATH) -> List[str]:
+    """Load a one-skill-per-line dictionary, returning an empty list if the file is missing."""
+    if not os.path.isfile(path):
+        return []
+    with open(path, "r", encoding="utf-8") as f:
+        return [normalize_skill(line) for line in f if line.strip()]
+
+def _trie_to_regex(node: dict) -> str:
+    """Emit a regex for a character trie; longer alternatives are tried first."""
+    if "" in node and len(node) == 1:
+        return ""
+    branches = []
+    for char in sorted(c for c in node if c):
+        piece = r"\s+" if char == " " else re.escape(char)
+        branches.append(piece + _trie_to_regex(node[char]))
+    if len(branches) == 1:
+        body = branches[0]
+    else:
+        body = "(?:" + "|".join(branches) + ")"
+    if "" in node:
+        body = "(?:" + body + ")?"
+    return body
+
+class SkillMatcher:
+    """Find every known skill (and synonym) in a text with a single regex pass."""
+
+    def __init__(self, skills: Iterable[str], synonyms: Optional[Dict[str, List[str]]] = None):
+        synonyms = synonyms or {}
+        # surface form -> canonical skills it stands for
+        canonical: Dict[str, Set[str]] = {}
+        for skill in skills:
+            skill = normalize_skill(skill)
+            if not skill:
+                continue
+            canonical.setdefault(skill, set()).add(skill)
+            for synonym in synonyms.get(skill, []):
+                canonical.setdefault(normalize_skill(synonym), set()).add(skill)
+        self.skills: FrozenSet[str] = frozenset(s for names in canonical.values() for s in names)
+
+        trie: dict = {}
+        for term in canonical:
+            node = trie
+            for char in term:
+                node = node.setdefault(char, {})
+            node[""] = {}
+        self._pattern = None
+        if canonical:
+            self._pattern = re.compile(r"(?<!\w)(?=(" + _trie_to_regex(trie) + r")(?!\w))")
+
+        # The scan reports the longest term at each word start, so shorter terms that end
+        # on a word boundary inside it ('spring' in 'spring boot') are implied by it.
+        self._implied: Dict[str, FrozenSet[str]] = {}
+        for term, names in canonical.items():
+            implied = set(names)
+            for other, other_names in canonical.items():
+                if len(other) < len(term) and term.startswith(other) and not _WORD_CHAR.match(term[len(other)]):
+                    implied |= other_names
+            self._implied[term] = frozenset(implied)
+
+    def find(self, text: str) -> Set[str]:
+        """Return the canonical skills present in the text."""
+        found: Set[str] = set()
+        if not text or self._pattern is None:
+            return found
+        for m in self._pattern.finditer(text.lower()):
+            found |= self._implied.get(" ".join(m.group(1).split()), frozenset())
+        return found
+
+    def match(self, text: str, skills: Iterable[str], found: Optional[Set[str]] = None) -> Tuple[List[str], List[str]]:
+        """
+        Split a skill list into (matched, missing), preserving the input order.
+
+        Args:
+            text (str): Resume text.
+            skills (Iterable[str]): Skills to check; must be part of this matcher's vocabulary.
+            found (Set[str], optional): Result of a previous find() on the same text.
+        """
+        if found is None:
+            found = self.find(text)
+        matched, missing = [], []
+        for skill in skills:
+            (matched if normalize_skill(skill) in found else missing).append(skill)
+        return matched, missing
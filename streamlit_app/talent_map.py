@@ -0,0 +1,111 @@
+"""
+talent_map.py
+
+Places new resumes on the precomputed talent map (data/resume_embeddings.csv: x, y, cluster per
+corpus resume, made offline by notebooks/embedding_analysis.ipynb with t-SNE + KMeans) without
+rerunning the notebook. t-SNE has no transform, so a new resume is positioned by kNN regression: the
+similarity-weighted mean map position of its nearest corpus resumes in TF-IDF space (the shared
+JDMatcher vectorizer). Its cluster is the nearest cluster centroid in the same space, i.e. what
+KMeans.predict does. A KD-tree over the 2-D map answers "who sits near this point" queries.
+Queries are vectorized with the vectorizer the corpus was, and the shared map is rebuilt when
+vectorizer.pkl is reloaded.
+"""
+import os
+import threading
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+from scipy.spatial import cKDTree
+from sklearn.preprocessing import normalize
+
+from data_loader import load_data_file
+from jd_matcher import JDMatcher, get_jd_matcher, top_k_indices
+
+DATA_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "data"))
+DEFAULT_EMBEDDINGS_PATH = os.path.join(DATA_DIR, "resume_embeddings.csv")
+DEFAULT_CORPUS_PATH = os.path.join(DATA_DIR, "UpdatedResumeDataSet.csv")
+
+class TalentMap:
+    """Incremental projection of resumes onto the offline 2-D map, single or batched."""
+
+    def __init__(self, embeddings_path: str = DEFAULT_EMBEDDINGS_PATH, corpus_path: str = DEFAULT_CORPUS_PATH,
+                 matcher: Optional[JDMatcher] = None, k: int = 10, text_column: str = "Resume"):
+        self.matcher = matcher or get_jd_matcher()
+        self.k = k
+        projection = load_data_file(embeddings_path, use_cache=False)
+        # The notebook dropped rows without text before projecting, so positions line up after dropna.
+        corpus = load_data_file(corpus_path, columns=[text_column]).dropna(subset=[text_column])
+        if len(corpus) != len(projection):
+            raise ValueError(f"{embeddings_path} has {len(projection)} rows but {corpus_path} has {len(corpus)} "
+                             "resumes; rerun notebooks/embedding_analysis.ipynb")
+        self.coords = projection[["x", "y"]].to_numpy(dtype=np.float64)
+        self.clusters = projection["cluster"].to_numpy()
+        self.cluster_ids = np.unique(self.clusters)
+        # Pinned: the matcher's vectorizer may be hot-reloaded, but corpus and centroids are in this one's space.
+        self.vectorizer = self.matcher.vectorizer
+        self.corpus = self.matcher.transform(corpus[text_column].astype(str).tolist(), self.vectorizer)
+        # One L2-normalized TF-IDF centroid per cluster (rows ordered like cluster_ids).
+        self.centroids = normalize(np.vstack([
+            np.asarray(self.corpus[self.clusters == c].mean(axis=0)) for c in self.cluster_ids
+        ]))
+        self.tree = cKDTree(self.coords)
+
+    def place_batch(self, texts: Sequence[str], k: Optional[int] = None, chunk_size: int = 256) -> List[dict]:
+        """
+        Place many resumes on the map at once.
+
+        Args:
+            texts (Sequence[str]): Resume texts.
+            k (int, optional): Neighbours used for the position (default: self.k).
+            chunk_size (int): Resumes scored per sparse matrix product (bounds the dense chunk x corpus block).
+        Returns:
+            List[dict]: {"x", "y", "cluster", "neighbours": [(corpus row, similarity %), ...]} per text;
+            x, y and cluster are None for text that shares no vocabulary with the corpus.
+        """
+        k = k or self.k
+        placements: List[dict] = []
+        for start in range(0, len(texts), chunk_size):
+            queries = self.matcher.transform(texts[start:start + chunk_size], self.vectorizer)
+            similarity = (queries @ self.corpus.T).toarray()
+            cluster_scores = np.asarray(queries @ self.centroids.T)
+            for row, scores in enumerate(similarity):
+                top = top_k_indices(scores, k)
+                top = top[scores[top] > 0]
+                if not len(top):
+                    placements.append({"x": None, "y": None, "cluster": None, "neighbours": []})
+                    continue
+                x, y = np.average(self.coords[top], axis=0, weights=scores[top])
+                placements.append({
+                    "x": round(float(x), 4),
+                    "y": round(float(y), 4),
+                    "cluster": int(self.cluster_ids[int(np.argmax(cluster_scores[row]))]),
+                    "neighbours": [(int(i), round(float(scores[i]) * 100, 2)) for i in top],
+                })
+        return placements
+
+    def place(self, text: str, k: Optional[int] = None) -> dict:
+        """Place one resume on the map (see place_batch)."""
+        return self.place_batch([text], k=k)[0]
+
+    def is_current(self) -> bool:
+        """False once the matcher has loaded a different vectorizer than the one the map was built with."""
+        return self.matcher.vectorizer is self.vectorizer
+
+    def nearby(self, x: float, y: float, k: int = 10) -> List[Dict[str, float]]:
+        """Corpus resumes closest to a map position: [{"row", "x", "y", "cluster", "distance"}, ...]."""
+        distances, rows = self.tree.query([x, y], k=min(k, len(self.coords)))
+        return [{"row": int(i), "x": float(self.coords[i, 0]), "y": float(self.coords[i, 1]),
+                 "cluster": int(self.clusters[i]), "distance": round(float(d), 4)}
+                for d, i in zip(np.atleast_1d(distances), np.atleast_1d(rows))]
+
+_talent_map: Optional[TalentMap] = None
+_talent_map_lock = threading.Lock()
+
+def get_talent_map() -> TalentMap:
+    """Return the shared map built from the shipped projection and corpus (rebuilt after a vectorizer reload)."""
+    global _talent_map
+    if _talent_map is None or not _talent_map.is_current():
+        with _talent_map_lock:
+            if _talent_map is None or not _talent_map.is_current():
+                _talent_map = TalentMap()
+    return _talent_map
@@ -0,0 +1,233 @@
+"""
+train_classifier.py
+
+Out-of-core training for the role classifier. The labelled CSV is streamed in chunks through a
+bounded shuffle buffer, vectorized with a stateless HashingVectorizer and fed to an SGD logistic
+regression via partial_fit, so memory stays flat however large the corpus grows. Each run writes a
+versioned artifact directory holding classifier.pkl, vectorizer.pkl and label_encoder.pkl in the
+layout ResumeRecommender loads, plus metadata.json with throughput and hold-out accuracy. A previous
+version can be warm-started and updated with new labelled batches. Promoting a version rewrites the
+model/CURRENT pointer in one rename; model/vectorizer.pkl is left alone because the JD matcher, the
+resume index and the talent map rely on its fitted TF-IDF vocabulary. With --dedup, near-duplicate
+resumes (dedup.py) are dropped once up front, so repeated CVs neither skew training nor leak into
+the hold-out set.
+
+Usage:
+    python streamlit_app/train_classifier.py --data data/UpdatedResumeDataSet.csv [--epochs 5]
+    python streamlit_app/train_classifier.py --data new_batch.csv --warm-start model/versions/<version>
+    python streamlit_app/train_classifier.py --data data/UpdatedResumeDataSet.csv --promote
+"""
+import argparse
+import hashlib
+import json
+import os
+import secrets
+import time
+from datetime import datetime, timezone
+from typing import AbstractSet, Iterator, List, Optional, Tuple
+
+import joblib
+import numpy as np
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.linear_model import SGDClassifier
+from sklearn.preprocessing import LabelEncoder
+
+from data_loader import iter_data_file
+from recommender import ARTIFACTS, CURRENT_VERSION_FILE, MODEL_DIR
+
+VERSIONS_DIR = os.path.join(MODEL_DIR, "versions")
+# 2**18 columns keep coef_ near 50 MB for 25 classes; every doubling doubles the model and the bundle.
+DEFAULT_N_FEATURES = 2 ** 18
+
+Batch = Tuple[List[str], List[str]]
+
+def make_vectorizer(n_features: int = DEFAULT_N_FEATURES) -> HashingVectorizer:
+    """Stateless vectorizer: nothing to fit, so chunks can be transformed independently."""
+    return HashingVectorizer(n_features=n_features, stop_words="english", alternate_sign=False,
+                             ngram_range=(1, 2), norm="l2")
+
+def is_holdout(text: str, fraction: float) -> bool:
+    """Deterministically assign a resume to the hold-out set by hashing its text."""
+    digest = hashlib.md5(text.encode("utf-8", "replace")).digest()
+    return int.from_bytes(digest[:4], "little") / 2 ** 32 < fraction
+
+def iter_rows(path: str, text_column: str, label_column: str, chunk_size: int,
+              skip: AbstractSet[int] = frozenset()) -> Iterator[Batch]:
+    """Yield (texts, labels) chunks from the CSV without loading it whole, minus the skipped row numbers."""
+    for chunk in iter_data_file(path, [text_column, label_column], chunk_size):
+        chunk = chunk.dropna()
+        if skip:
+            chunk = chunk[~chunk.index.isin(skip)]
+        yield chunk[text_column].astype(str).tolist(), chunk[label_column].astype(str).tolist()
+
+def scan_labels(path: str, label_column: str, chunk_size: int) -> List[str]:
+    """One cheap pass over the label column only (partial_fit needs every class up front)."""
+    labels = set()
+    for chunk in iter_data_file(path, [label_column], chunk_size):
+        labels.update(chunk[label_column].dropna().astype(str))
+    return sorted(labels)
+
+def duplicate_rows(path: str, text_column: str, chunk_size: int) -> AbstractSet[int]:
+    """Row numbers of near-duplicate resumes (every copy after the first), from one streaming pass."""
+    from dedup import find_near_duplicates
+
+    def rows():
+        for chunk in iter_data_file(path, [text_column], chunk_size):
+            yield from chunk[text_column].dropna().astype(str).items()
+    return frozenset(find_near_duplicates(rows()))
+
+def shuffled_batches(chunks: Iterator[Batch], buffer_size: int, batch_size: int,
+                     rng: np.random.Generator) -> Iterator[Batch]:
+    """
+    Approximately shuffle a stream with a bounded buffer. Exports are often sorted by category, and
+    SGD trained on label-sorted batches forgets earlier classes.
+    """
+    texts: List[str] = []
+    labels: List[str] = []
+
+    def drain(keep: int) -> Iterator[Batch]:
+        while len(texts) > keep:
+            take = rng.choice(len(texts), size=min(batch_size, len(texts)), replace=False)
+            take_set = set(take.tolist())
+            yield [texts[i] for i in take], [labels[i] for i in take]
+            kept = [i for i in range(len(texts)) if i not in take_set]
+            texts[:] = [texts[i] for i in kept]
+            labels[:] = [labels[i] for i in kept]
+
+    for chunk_texts, chunk_labels in chunks:
+        texts.extend(chunk_texts)
+        labels.extend(chunk_labels)
+        yield from drain(buffer_size)
+    yield from drain(0)
+
+def training_rows(path: str, text_column: str, label_column: str, chunk_size: int,
+                  holdout: float, skip: AbstractSet[int] = frozenset()) -> Iterator[Batch]:
+    """iter_rows() minus the hold-out rows."""
+    for texts, labels in iter_rows(path, text_column, label_column, chunk_size, skip):
+        keep = [i for i, text in enumerate(texts) if not is_holdout(text, holdout)]
+        yield [texts[i] for i in keep], [labels[i] for i in keep]
+
+def load_version(path: str) -> Tuple[SGDClassifier, HashingVectorizer, LabelEncoder, dict]:
+    with open(os.path.join(path, "metadata.json"), "r", encoding="utf-8") as f:
+        metadata = json.load(f)
+    return (joblib.load(os.path.join(path, "classifier.pkl")), joblib.load(os.path.join(path, "vectorizer.pkl")),
+            joblib.load(os.path.join(path, "label_encoder.pkl")), metadata)
+
+def evaluate(path: str, classifier, vectorizer, encoder: LabelEncoder, text_column: str, label_column: str,
+             chunk_size: int, holdout: float, skip: AbstractSet[int] = frozenset()) -> Tuple[float, int]:
+    """Accuracy on the hold-out rows, streamed like training."""
+    correct = total = 0
+    known = set(encoder.classes_)
+    for texts, labels in iter_rows(path, text_column, label_column, chunk_size, skip):
+        rows = [i for i, text in enumerate(texts) if is_holdout(text, holdout) and labels[i] in known]
+        if not rows:
+            continue
+        predicted = classifier.predict(vectorizer.transform([texts[i] for i in rows]))
+        correct += int(np.sum(predicted == encoder.transform([labels[i] for i in rows])))
+        total += len(rows)
+    return (correct / total if total else 0.0), total
+
+def train(data_path: str, out_dir: str = VERSIONS_DIR, warm_start: Optional[str] = None, epochs: int = 5,
+          chunk_size: int = 1000, batch_size: int = 256, buffer_size: int = 10000, holdout: float = 0.1,
+          text_column: str = "Resume", label_column: str = "Category", seed: int = 0, dedup: bool = False,
+          n_features: int = DEFAULT_N_FEATURES) -> str:
+    """
+    Train (or update) the role classifier from a CSV and write a new versioned artifact directory.
+    A warm start keeps the previous version's vectorizer, so n_features only applies to new models.
+
+    Returns:
+        str: Path of the new version directory.
+    """
+    rng = np.random.default_rng(seed)
+    labels = scan_labels(data_path, label_column, chunk_size)
+    if warm_start:
+        classifier, vectorizer, encoder, previous = load_version(warm_start)
+        unknown = sorted(set(labels) - set(encoder.classes_))
+        if unknown:
+            raise ValueError(f"Labels not in the warm-start model (retrain from scratch to add them): {unknown}")
+    else:
+        classifier = SGDClassifier(loss="log_loss", alpha=1e-5, random_state=seed)
+        vectorizer = make_vectorizer(n_features)
+        encoder = LabelEncoder().fit(labels)
+        previous = {}
+    class_ids = np.arange(len(encoder.classes_))
+    skip = duplicate_rows(data_path, text_column, chunk_size) if dedup else frozenset()
+
+    n_train = 0
+    start = time.perf_counter()
+    for _ in range(epochs):
+        rows = training_rows(data_path, text_column, label_column, chunk_size, holdout, skip)
+        for texts, batch_labels in shuffled_batches(rows, buffer_size, batch_size, rng):
+            classifier.partial_fit(vectorizer.transform(texts), encoder.transform(batch_labels), classes=class_ids)
+            n_train += len(texts)
+    elapsed = time.perf_counter() - start
+    accuracy, n_holdout = evaluate(data_path, classifier, vectorizer, encoder, text_column, label_column,
+                                   chunk_size, holdout, skip)
+
+    # The random suffix keeps runs finishing in the same second apart; makedirs still refuses to reuse a dir.
+    version = datetime.now(timezone.utc).strftime("v%Y%m%d-%H%M%S-") + secrets.token_hex(3)
+    path = os.path.join(out_dir, version)
+    os.makedirs(path)
+    for name, obj in zip(ARTIFACTS, (classifier, vectorizer, encoder)):
+        joblib.dump(obj, os.path.join(path, name))
+    metadata = {
+        "version": version,
+        "data": os.path.abspath(data_path),
+        "warm_start_from": previous.get("version"),
+        "epochs": epochs,
+        "train_documents_seen": n_train,
+        "duplicates_skipped": len(skip),
+        "holdout_documents": n_holdout,
+        "holdout_accuracy": round(accuracy, 4),
+        "train_seconds": round(elapsed, 2),
+        "docs_per_second": round(n_train / elapsed, 1) if elapsed else 0.0,
+        "n_features": vectorizer.n_features,
+        "classes": encoder.classes_.tolist(),
+    }
+    with open(os.path.join(path, "metadata.json"), "w", encoding="utf-8") as f:
+        json.dump(metadata, f, indent=2)
+    return path
+
+def promote(version_path: str, pointer_path: str = CURRENT_VERSION_FILE) -> None:
+    """
+    Make a version the one ResumeRecommender serves by pointing model/CURRENT at it.
+
+    The pointer is replaced with a single rename, so readers see either the old version or the new one,
+    never a mix of their artifacts.
+    """
+    missing = [name for name in ARTIFACTS if not os.path.isfile(os.path.join(version_path, name))]
+    if missing:
+        raise FileNotFoundError(f"{version_path} is missing {', '.join(missing)}")
+    model_dir = os.path.dirname(os.path.abspath(pointer_path))
+    tmp = f"{pointer_path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(os.path.relpath(os.path.abspath(version_path), model_dir) + "\n")
+    os.replace(tmp, pointer_path)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Stream-train the resume role classifier.")
+    parser.add_argument("--data", required=True, help="CSV with resume text and category columns.")
+    parser.add_argument("--out", default=VERSIONS_DIR, help="Directory for versioned artifacts.")
+    parser.add_argument("--warm-start", help="Version directory to continue training from.")
+    parser.add_argument("--epochs", type=int, default=5)
+    parser.add_argument("--chunk-size", type=int, default=1000, help="CSV rows read at a time.")
+    parser.add_argument("--batch-size", type=int, default=256, help="Rows per partial_fit call.")
+    parser.add_argument("--buffer-size", type=int, default=10000, help="Shuffle buffer (bounds memory).")
+    parser.add_argument("--holdout", type=float, default=0.1, help="Fraction of rows held out for accuracy.")
+    parser.add_argument("--text-column", default="Resume")
+    parser.add_argument("--label-column", default="Category")
+    parser.add_argument("--n-features", type=int, default=DEFAULT_N_FEATURES,
+                        help="Hashing vectorizer columns for a new model (ignored with --warm-start).")
+    parser.add_argument("--promote", action="store_true", help="Serve the new version (updates model/CURRENT).")
+    parser.add_argument("--dedup", action="store_true", help="Drop near-duplicate resumes before training.")
+    args = parser.parse_args()
+    path = train(args.data, args.out, args.warm_start, args.epochs, args.chunk_size, args.batch_size,
+                 args.buffer_size, args.holdout, args.text_column, args.label_column, dedup=args.dedup,
+                 n_features=args.n_features)
+    if args.promote:
+        promote(path)
+    with open(os.path.join(path, "metadata.json"), "r", encoding="utf-8") as f:
+        print(f.read())
+
+if __name__ == "__main__":
+    main()
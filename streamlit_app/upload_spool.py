@@ -0,0 +1,106 @@
+"""
+upload_spool.py
+
+Bounded on-disk spool for uploads that need to outlive a request. Files are named by the SHA-256 of
+their content (so concurrent uploads never collide and re-uploads are stored once), expire after a
+TTL, and the oldest files are evicted when the directory grows past its size cap. A background
+janitor thread enforces both limits.
+"""
+import hashlib
+import os
+import threading
+import time
+from typing import Optional, Union
+import config
+
+Buffer = Union[bytes, bytearray, memoryview]
+
+class UploadSpool:
+    """Content-addressed upload directory with TTL expiry and a total size cap."""
+
+    def __init__(self, directory: str, ttl_seconds: float = 3600, max_bytes: int = 512 * 1024 * 1024,
+                 janitor_interval: Optional[float] = None):
+        self.directory = directory
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        interval = janitor_interval if janitor_interval is not None else min(max(ttl_seconds / 2, 1.0), 300.0)
+        self._stop = threading.Event()
+        self._janitor = threading.Thread(target=self._run_janitor, args=(interval,), name="upload-spool-janitor",
+                                         daemon=True)
+        self._janitor.start()
+
+    def path_for(self, data: Buffer, filename: str) -> str:
+        """Return the spool path for this content (the original extension is kept)."""
+        digest = hashlib.sha256(data).hexdigest()
+        return os.path.join(self.directory, digest + os.path.splitext(filename)[1].lower())
+
+    def save(self, data: Buffer, filename: str) -> str:
+        """Write data to the spool (once per distinct content) and return its path."""
+        path = self.path_for(data, filename)
+        with self._lock:
+            if os.path.isfile(path):
+                os.utime(path)  # refresh the TTL for a re-upload
+                return path
+            tmp = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        self.cleanup()
+        return path
+
+    def cleanup(self) -> int:
+        """Delete expired files, then the oldest files while over the size cap. Returns files removed."""
+        removed = 0
+        now = time.time()
+        with self._lock:
+            entries = []
+            for name in os.listdir(self.directory):
+                path = os.path.join(self.directory, name)
+                try:
+                    st = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                if now - st.st_mtime > self.ttl_seconds:
+                    removed += self._remove(path)
+                else:
+                    entries.append((st.st_mtime, st.st_size, path))
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                removed += self._remove(path)
+                total -= size
+        return removed
+
+    @staticmethod
+    def _remove(path: str) -> int:
+        try:
+            os.remove(path)
+            return 1
+        except FileNotFoundError:
+            return 0
+
+    def _run_janitor(self, interval: float) -> None:
+        while not self._stop.wait(interval):
+            try:
+                self.cleanup()
+            except OSError:
+                pass  # the directory may be removed out from under us; try again next round
+
+    def close(self) -> None:
+        """Stop the janitor thread."""
+        self._stop.set()
+
+_spool = None
+_spool_lock = threading.Lock()
+
+def get_upload_spool() -> UploadSpool:
+    """Return the shared upload spool (TTL and size cap from config), for uploads that must be persisted."""
+    global _spool
+    if _spool is None:
+        with _spool_lock:
+            if _spool is None:
+                _spool = UploadSpool(config.UPLOAD_SPOOL_DIR, config.UPLOAD_TTL_SECONDS, config.UPLOAD_SPOOL_MAX_BYTES)
+    return _spool
@@ -0,0 +1,78 @@
+"""
+Regression checks for section_segmenter against the shipped resume dataset.
+
+The segmenter must find at least as many education and experience sections as the line-based parser
+it replaced (kept below as the reference), and must not take list items or job titles for headers.
+"""
+import csv
+import os
+import re
+import sys
+
+import pytest
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(ROOT, "streamlit_app"))
+
+from section_segmenter import SectionSegmenter  # noqa: E402
+
+DATASET = os.path.join(ROOT, "data", "UpdatedResumeDataSet.csv")
+
+def reference_sections(text: str) -> dict:
+    """The original line-by-line extract_sections (substring match on each cleaned line)."""
+    section_headers = {
+        'education': [r'education', r'academic background', r'qualifications'],
+        'experience': [r'experience', r'work experience', r'professional experience', r'employment'],
+    }
+    current_section = None
+    sections = {k: [] for k in section_headers}
+    for line in text.splitlines():
+        line_clean = line.strip().lower().replace(':', '').replace('-', '').replace('•', '').replace('>', '')
+        for key, headers in section_headers.items():
+            if any(re.fullmatch(h, line_clean) or h in line_clean for h in headers):
+                current_section = key
+                break
+        else:
+            if current_section and line.strip():
+                sections[current_section].append(line.strip())
+    return {k: '\n'.join(v).strip() for k, v in sections.items()}
+
+@pytest.fixture(scope="module")
+def resumes():
+    if not os.path.isfile(DATASET):
+        pytest.skip("dataset not available")
+    csv.field_size_limit(sys.maxsize)
+    with open(DATASET, "r", encoding="utf-8", errors="replace", newline="") as f:
+        return [row["Resume"] for row in csv.DictReader(f)]
+
+@pytest.mark.parametrize("section", ["education", "experience"])
+def test_corpus_hit_rate_does_not_drop(resumes, section):
+    segmenter = SectionSegmenter()
+    found = sum(any(s.name == section and text[s.start:s.end].strip() for s in segmenter.segment(text))
+                for text in resumes)
+    reference = sum(bool(reference_sections(text)[section]) for text in resumes)
+    assert found >= reference
+
+@pytest.mark.parametrize("line, expected", [
+    ("Education Details", "education"),
+    ("...understanding of Deep learning.Education Details ", "education"),
+    ("Company Details", "experience"),
+    ("Skill Details", "skills"),
+    ("Employment History", "experience"),
+    ("EDUCATION DETAILS", "education"),
+    ("Skills: Python, SQL", "skills"),
+    ("• Skills", "skills"),
+    ("Project Manager", None),
+    ("- Project Name Nestle", None),
+    ("Skills Used", None),
+    ("- Skills: Python", None),
+    ("please see the company details", None),
+])
+def test_header_lines(line, expected):
+    assert SectionSegmenter().header(line) == expected
+
+def test_inline_header_body_starts_after_colon():
+    text = "Skills: Python, SQL\nJava\nEDUCATION\nBSc\n"
+    sections = SectionSegmenter().segment(text)
+    assert [(s.name, text[s.start:s.end]) for s in sections] == [("skills", "Python, SQL\nJava\n"),
+                                                                   ("education", "BSc\n")]